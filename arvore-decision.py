@@ -1,105 +1,105 @@
-import numpy as np
-import pandas as pd
-from sklearn.metrics import confusion_matrix
-from sklearn.cross_validation import train_test_split
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.metrics import accuracy_score
-from sklearn.metrics import classification_report
-
-
-# Funções dos imports database
-def importdata():
-    balance_data = pd.read_csv(
-        'https://archive.ics.uci.edu/ml/machine-learning-' +
-        'databases/balance-scale/balance-scale.data',
-        sep=',', header=None)
-
-    # Imprimindo os Datawest
-    print("Dataset Length: ", len(balance_data))
-    print("Dataset Shape: ", balance_data.shape)
-
-    # Printing the dataset obseravtions
-    print("Dataset: ", balance_data.head())
-    return balance_data
-
-
-# Função do dataset
-def splitdataset(balance_data):
-    # Separating the target variable
-    X = balance_data.values[:, 1:5]
-    Y = balance_data.values[:, 0]
-
-    # Testes do dataset
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, Y, test_size=0.3, random_state=100)
-
-    return X, Y, X_train, X_test, y_train, y_test
-
-
-# Função para treinamento com a giniIndex
-def train_using_gini(X_train, X_test, y_train):
-    # Creating the classifier object
-    clf_gini = DecisionTreeClassifier(criterion="gini",
-                                      random_state=100, max_depth=3, min_samples_leaf=5)
-
-    # Realizando o treinamento
-    clf_gini.fit(X_train, y_train)
-    return clf_gini
-
-
-# Função para treinamento com entropy.
-def tarin_using_entropy(X_train, X_test, y_train):
-    # Decision tree with entropy
-    clf_entropy = DecisionTreeClassifier(
-        criterion="entropy", random_state=100,
-        max_depth=3, min_samples_leaf=5)
-
-    # Realização do treinamento
-    clf_entropy.fit(X_train, y_train)
-    return clf_entropy
-
-
-# Função para fazer previsões
-def prediction(X_test, clf_object):
-    # Teste de previsões com giniIndex
-    y_pred = clf_object.predict(X_test)
-    print("Predicted values:")
-    print(y_pred)
-    return y_pred
-
-
-# Função para calcular o accuracy
-def cal_accuracy(y_test, y_pred):
-    print("Confusion Matrix: ",
-          confusion_matrix(y_test, y_pred))
-
-    print("Accuracy : ",
-          accuracy_score(y_test, y_pred) * 100)
-
-    print("Report : ",
-          classification_report(y_test, y_pred))
-
-
-def main():
-    # Fase de construção
-    data = importdata()
-    X, Y, X_train, X_test, y_train, y_test = splitdataset(data)
-    clf_gini = train_using_gini(X_train, X_test, y_train)
-    clf_entropy = tarin_using_entropy(X_train, X_test, y_train)
-
-    # Operação de construção
-    print("Results Using Gini Index:")
-
-    # Prediction using gini
-    y_pred_gini = prediction(X_test, clf_gini)
-    cal_accuracy(y_test, y_pred_gini)
-
-    print("Results Using Entropy:")
-    # Previsão usando entropy
-    y_pred_entropy = prediction(X_test, clf_entropy)
-    cal_accuracy(y_test, y_pred_entropy)
-
-
-# Calculo da função
-if __name__ == "__main__":
+import numpy as np
+import pandas as pd
+from sklearn.metrics import confusion_matrix
+from sklearn.cross_validation import train_test_split
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.metrics import classification_report
+
+
+# Funções dos imports database
+def importdata():
+    balance_data = pd.read_csv(
+        'https://archive.ics.uci.edu/ml/machine-learning-' +
+        'databases/balance-scale/balance-scale.data',
+        sep=',', header=None)
+
+    # Imprimindo os Datawest
+    print("Dataset Length: ", len(balance_data))
+    print("Dataset Shape: ", balance_data.shape)
+
+    # Printing the dataset obseravtions
+    print("Dataset: ", balance_data.head())
+    return balance_data
+
+
+# Função do dataset
+def splitdataset(balance_data):
+    # Separating the target variable
+    X = balance_data.values[:, 1:5]
+    Y = balance_data.values[:, 0]
+
+    # Testes do dataset
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, Y, test_size=0.3, random_state=100)
+
+    return X, Y, X_train, X_test, y_train, y_test
+
+
+# Função para treinamento com a giniIndex
+def train_using_gini(X_train, X_test, y_train):
+    # Creating the classifier object
+    clf_gini = DecisionTreeClassifier(criterion="gini",
+                                      random_state=100, max_depth=3, min_samples_leaf=5)
+
+    # Realizando o treinamento
+    clf_gini.fit(X_train, y_train)
+    return clf_gini
+
+
+# Função para treinamento com entropy.
+def tarin_using_entropy(X_train, X_test, y_train):
+    # Decision tree with entropy
+    clf_entropy = DecisionTreeClassifier(
+        criterion="entropy", random_state=100,
+        max_depth=3, min_samples_leaf=5)
+
+    # Realização do treinamento
+    clf_entropy.fit(X_train, y_train)
+    return clf_entropy
+
+
+# Função para fazer previsões
+def prediction(X_test, clf_object):
+    # Teste de previsões com giniIndex
+    y_pred = clf_object.predict(X_test)
+    print("Predicted values:")
+    print(y_pred)
+    return y_pred
+
+
+# Função para calcular o accuracy
+def cal_accuracy(y_test, y_pred):
+    print("Confusion Matrix: ",
+          confusion_matrix(y_test, y_pred))
+
+    print("Accuracy : ",
+          accuracy_score(y_test, y_pred) * 100)
+
+    print("Report : ",
+          classification_report(y_test, y_pred))
+
+
+def main():
+    # Fase de construção
+    data = importdata()
+    X, Y, X_train, X_test, y_train, y_test = splitdataset(data)
+    clf_gini = train_using_gini(X_train, X_test, y_train)
+    clf_entropy = tarin_using_entropy(X_train, X_test, y_train)
+
+    # Operação de construção
+    print("Results Using Gini Index:")
+
+    # Prediction using gini
+    y_pred_gini = prediction(X_test, clf_gini)
+    cal_accuracy(y_test, y_pred_gini)
+
+    print("Results Using Entropy:")
+    # Previsão usando entropy
+    y_pred_entropy = prediction(X_test, clf_entropy)
+    cal_accuracy(y_test, y_pred_entropy)
+
+
+# Calculo da função
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""Execucao em lote de programas LogoASM.
+
+    logovm batch [-w WORKERS] [-o DIR] SOURCE [opcoes da VM...]
+
+SOURCE e um diretorio (todos os seus arquivos `.lasm`) ou um manifesto:
+um arquivo texto com um programa por linha, seguido dos seus argumentos.
+Linhas vazias e comentarios `#` sao ignorados, e caminhos relativos sao
+resolvidos a partir do diretorio do manifesto. As opcoes depois de
+SOURCE (por exemplo, `-n` ou `--compile py`) valem para todos os
+programas.
+
+Os programas rodam em um ProcessPoolExecutor. Cada processo executa
+muitos programas, cada um em uma LogoVM nova, sem reimportar modulos. O
+resultado de cada programa (codigo de saida, saida padrao, imagem,
+numero de instrucoes e tempo de parede) e gravado, na ordem da entrada,
+em `DIR/results.jsonl`; as imagens tambem ficam em DIR.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import shlex
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from logovm.main import create_vm, parse_command_line, run_file
+
+
+def available_cpus():
+    """Obter o numero de processadores disponiveis para o processo."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def read_jobs(source):
+    """Listar os programas (arquivo, argumentos) do diretorio ou manifesto."""
+    if os.path.isdir(source):
+        return [
+            (os.path.join(source, name), [])
+            for name in sorted(os.listdir(source))
+            if name.endswith(".lasm")
+        ]
+    jobs = []
+    base = os.path.dirname(source)
+    with open(source, "rt", encoding="utf-8") as manifest:
+        for line in manifest:
+            words = shlex.split(line, comments=True)
+            if words:
+                jobs.append((os.path.join(base, words[0]), words[1:]))
+    return jobs
+
+
+def __init_worker():
+    """Preparar o processo filho: programas nao leem da entrada padrao."""
+    sys.stdin = io.StringIO()
+
+
+def run_job(job):
+    """Executar um programa em uma LogoVM nova, no processo filho."""
+    index, program, args, vm_options, outdir = job
+    stem = os.path.splitext(os.path.basename(program))[0]
+    result = {"program": program, "args": args, "exit_code": 1}
+    stdout, stderr = io.StringIO(), io.StringIO()
+    vm = options = None
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(
+            stderr
+        ):
+            options = parse_command_line(
+                [
+                    *vm_options,
+                    "--image",
+                    os.path.join(outdir, f"{index:05d}-{stem}"),
+                    "--",
+                    program,
+                    *args,
+                ]
+            )
+            vm = create_vm(options)
+            result["exit_code"] = run_file(options, vm)
+    except (Exception, SystemExit) as error:  # pylint: disable=broad-except
+        result["error"] = f"{type(error).__name__}: {error}"
+    result["wall_time"] = time.perf_counter() - start
+    result["stdout"] = stdout.getvalue()
+    result["stderr"] = stderr.getvalue()
+    result["image"] = vm.image_path if vm is not None else None
+    if vm is not None and not options.compile:
+        result["instructions"] = vm.instructions
+    else:
+        result["instructions"] = None
+    return result
+
+
+def main(args=None):
+    """Ponto de entrada do executor em lote."""
+    parser = argparse.ArgumentParser(
+        prog="logovm batch",
+        description="Run many LogoASM programs in a process pool.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=available_cpus(),
+        help="Number of worker processes (default: available CPUs).",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="DIR",
+        default="batch-results",
+        help="Directory for images and 'results.jsonl'.",
+    )
+    parser.add_argument(
+        "source", help="Directory of '.lasm' programs, or a manifest file."
+    )
+    parser.add_argument(
+        "vm_options",
+        nargs=argparse.REMAINDER,
+        help="LogoVM options used for every program.",
+    )
+    options = parser.parse_args(args)
+
+    os.makedirs(options.output, exist_ok=True)
+    jobs = [
+        (index, program, program_args, options.vm_options, options.output)
+        for index, (program, program_args) in enumerate(
+            read_jobs(options.source)
+        )
+    ]
+    results = os.path.join(options.output, "results.jsonl")
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        options.workers, initializer=__init_worker
+    ) as pool, open(results, "wt", encoding="utf-8") as output:
+        chunksize = max(1, len(jobs) // (options.workers * 4))
+        for result in pool.map(run_job, jobs, chunksize=chunksize):
+            output.write(json.dumps(result) + "\n")
+            if result["exit_code"] != 0:
+                failed += 1
+                logging.warning(
+                    "%s: exit code %d", result["program"], result["exit_code"]
+                )
+    print(
+        f"{len(jobs)} programs, {failed} failed, "
+        f"{time.perf_counter() - start:.2f}s: {results}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
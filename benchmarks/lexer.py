@@ -0,0 +1,103 @@
+"""Comparar o lexer do PLY com o lexer rapido do LogoASM.
+
+    python benchmarks/lexer.py [-n REPEAT] [-m MEGABYTES] [program...]
+
+Verifica, token a token (tipo, valor, linha e posicao), que os dois
+lexers produzem a mesma sequencia para os programas dados (por padrao,
+os exemplos do repositorio) e para um programa gerado com MEGABYTES MiB,
+e mede o tempo de cada lexer sobre o programa gerado.
+"""
+
+import argparse
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+
+from logoasm.lexer import StreamLexer, lexer
+from logoasm.scanner import scanner
+
+from sources import generate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = (
+    "area.py",
+    "counter.py",
+    "draw.py",
+    "start-new.py",
+    "start.pixel.py",
+)
+LEXERS = {"ply": lexer, "fast": scanner}
+
+
+def read_source(filename):
+    """Ler o programa inteiro."""
+    with open(filename, "rt") as input_file:
+        return input_file.read()
+
+
+def tokenize(factory, source):
+    """Obter a lista de tokens (tipo, valor, linha, posicao) do texto."""
+    return [
+        (token.type, token.value, token.lineno, token.lexpos)
+        for token in StreamLexer(factory(), io.StringIO(source))
+    ]
+
+
+def compare(name, source):
+    """Verificar que os dois lexers produzem os mesmos tokens."""
+    expected = tokenize(lexer, source)
+    found = tokenize(scanner, source)
+    for index, (want, got) in enumerate(zip(expected, found)):
+        if want != got:
+            print(f"{name}: token {index}: ply {want!r}, fast {got!r}")
+            return False
+    if len(expected) != len(found):
+        print(f"{name}: ply {len(expected)} tokens, fast {len(found)}")
+        return False
+    print(f"{name}: {len(expected)} tokens, identical")
+    return True
+
+
+def main():
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("-m", "--megabytes", type=float, default=4.0)
+    parser.add_argument(
+        "programs",
+        nargs="*",
+        default=[os.path.join(ROOT, name) for name in SAMPLES],
+    )
+    options = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    identical = all(
+        [
+            compare(os.path.basename(program), read_source(program))
+            for program in options.programs
+        ]
+    )
+    source = generate(options.megabytes)
+    identical = compare(f"generated {options.megabytes} MiB", source) and (
+        identical
+    )
+
+    for name, factory in LEXERS.items():
+        times = []
+        for _ in range(options.repeat):
+            start = time.perf_counter()
+            tokenize(factory, source)
+            times.append(time.perf_counter() - start)
+        median = statistics.median(times)
+        print(
+            f"{name:5s} median {median * 1000:8.1f} ms"
+            f"  {options.megabytes / median:6.2f} MiB/s"
+        )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
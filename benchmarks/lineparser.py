@@ -0,0 +1,124 @@
+"""Comparar o parser do PLY com o parser de linhas do LogoASM.
+
+    python benchmarks/lineparser.py [-n REPEAT] [-m MEGABYTES] [program...]
+
+Verifica que os dois parsers produzem o mesmo simbolo inicial e a mesma
+tabela de simbolos (na mesma ordem, com os mesmos atributos, codigo e
+linhas) para os programas dados (por padrao, os exemplos do repositorio)
+e para um programa gerado com MEGABYTES MiB, e mede o tempo de montagem
+do programa gerado com o PLY (com cada lexer) e com o parser de linhas.
+"""
+
+import argparse
+import functools
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from logoasm import lineparser
+from logoasm.parser import ParserObject, parse_program
+from logoasm.symtable import SymbolTable, set_symbol_table
+from logovm.main import add_internal_functions
+
+from sources import generate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = (
+    "area.py",
+    "counter.py",
+    "draw.py",
+    "start-new.py",
+    "start.pixel.py",
+)
+PARSERS = {
+    "ply": parse_program,
+    "ply+fast": functools.partial(parse_program, tokenizer="fast"),
+    "lines": lineparser.parse_program,
+}
+
+
+def assemble(parse, filename):
+    """Montar o programa em uma tabela nova: (inicio, simbolos)."""
+    table = SymbolTable()
+    set_symbol_table(table)
+    add_internal_functions()
+    start = parse(filename)
+    symbols = [
+        (
+            name,
+            [
+                (
+                    key,
+                    vars(value) if isinstance(value, ParserObject) else value,
+                )
+                for key, value in symbol.items()
+            ],
+        )
+        for name, symbol in table.iter_symbols()
+    ]
+    return start, symbols
+
+
+def compare(name, filename):
+    """Verificar que os dois parsers produzem a mesma tabela de simbolos."""
+    expected_start, expected = assemble(parse_program, filename)
+    found_start, found = assemble(lineparser.parse_program, filename)
+    if expected_start != found_start:
+        print(f"{name}: start ply {expected_start!r}, lines {found_start!r}")
+        return False
+    for want, got in zip(expected, found):
+        if want != got:
+            print(f"{name}: ply {want!r}, lines {got!r}")
+            return False
+    if len(expected) != len(found):
+        print(f"{name}: ply {len(expected)} symbols, lines {len(found)}")
+        return False
+    print(f"{name}: {len(expected)} symbols, identical")
+    return True
+
+
+def main():
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--repeat", type=int, default=3)
+    parser.add_argument("-m", "--megabytes", type=float, default=4.0)
+    parser.add_argument(
+        "programs",
+        nargs="*",
+        default=[os.path.join(ROOT, name) for name in SAMPLES],
+    )
+    options = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    identical = all(
+        [
+            compare(os.path.basename(program), program)
+            for program in options.programs
+        ]
+    )
+    with tempfile.TemporaryDirectory(prefix="logovm-bench-") as workdir:
+        generated = os.path.join(workdir, "generated.lasm")
+        with open(generated, "wt", encoding="utf-8") as output:
+            output.write(generate(options.megabytes))
+        title = f"generated {options.megabytes} MiB"
+        identical = compare(title, generated) and identical
+
+        for name, parse in PARSERS.items():
+            times = []
+            for _ in range(options.repeat):
+                start = time.perf_counter()
+                assemble(parse, generated)
+                times.append(time.perf_counter() - start)
+            median = statistics.median(times)
+            print(
+                f"{name:8s} median {median * 1000:8.1f} ms"
+                f"  {options.megabytes / median:6.2f} MiB/s"
+            )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
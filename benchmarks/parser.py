@@ -0,0 +1,46 @@
+"""Medir o tempo de montagem de procedimentos muito longos.
+
+    python benchmarks/parser.py [-l {ply,fast}] [-s SIZES]
+
+Monta programas com um unico DEF de N instrucoes em linha reta, para cada
+N em SIZES (por padrao 10^5, 3*10^5 e 10^6), e imprime o tempo total e
+o tempo por instrucao, que deve ficar constante se a montagem e linear.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from logoasm.parser import LEXERS, parse_program
+from logoasm.symtable import SymbolTable, set_symbol_table
+
+from sources import straight_line
+
+
+def main():
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-l", "--lexer", choices=sorted(LEXERS), default="ply")
+    parser.add_argument("-s", "--sizes", default="100000,300000,1000000")
+    options = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="logovm-bench-") as workdir:
+        for size in (int(size) for size in options.sizes.split(",")):
+            program = os.path.join(workdir, f"straight-{size}.lasm")
+            with open(program, "wt", encoding="utf-8") as output:
+                output.write(straight_line(size))
+            set_symbol_table(SymbolTable())
+            start = time.perf_counter()
+            parse_program(program, options.lexer)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{size:9d} statements  {elapsed:8.2f} s"
+                f"  {elapsed / size * 1e6:6.2f} us/statement"
+            )
+
+
+if __name__ == "__main__":
+    main()
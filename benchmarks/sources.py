@@ -0,0 +1,86 @@
+"""Gerar programas LogoASM grandes para os benchmarks do montador.
+
+Os programas usam todas as construcoes da linguagem (diretivas,
+variaveis, procedimentos, etiquetas, numeros, strings e comentarios) e
+sao validos: podem ser montados, mas nao sao feitos para executar.
+"""
+
+import random
+
+PROCEDURE = """\
+# Procedimento {index}: {comment}
+DEF proc_{index}:
+  LOAD var_{var}
+  PUSH {number}
+  ADD
+  STOR var_{var}
+  CMP {float}
+  JZ :skip_{index}
+  PUSH "texto {index}"
+  PUSH 1
+  CALL WRITE
+:skip_{index}
+  PUSH 'outro texto'
+  POP
+  LOAD var_{var}
+  PUSH -{number}
+  MUL
+  TRUNC
+  SKIPZ
+  JP :end_{index}
+  PUSH 2
+  POW
+  CALL proc_{callee}
+:end_{index}
+  RET
+
+"""
+
+
+def generate(megabytes, seed=0):
+    """Gerar o texto de um programa com aproximadamente `megabytes` MiB."""
+    rng = random.Random(seed)
+    size = int(megabytes * 1024 * 1024)
+    variables = 64
+    parts = [".START __main__\n.INIT 0 0 200 200\n\n.DATA\n"]
+    parts.extend(f"    var_{n} {n}\n" for n in range(variables))
+    parts.append("\n.CODE\n\n")
+    length = sum(len(part) for part in parts)
+    index = 0
+    while length < size:
+        part = PROCEDURE.format(
+            index=index,
+            comment="gerado " * rng.randint(1, 8),
+            var=rng.randrange(variables),
+            number=rng.randint(0, 10**6),
+            float=f"{rng.random() * 100:.3f}",
+            callee=rng.randrange(index) if index else 0,
+        )
+        parts.append(part)
+        length += len(part)
+        index += 1
+    parts.append("DEF __main__:\n  CALL proc_0\n  HALT\n")
+    return "".join(parts)
+
+
+STATEMENTS = (
+    "  LOAD x\n",
+    "  PUSH 3\n",
+    "  ADD\n",
+    "  DUP\n",
+    "  STOR x\n",
+    "  PUSH 'texto'\n",
+    "  POP\n",
+    "  CMP 10\n",
+)
+
+
+def straight_line(statements):
+    """Gerar um programa com um unico DEF de `statements` instrucoes."""
+    body = STATEMENTS * (statements // len(STATEMENTS))
+    body += STATEMENTS[: statements % len(STATEMENTS)]
+    return "".join(
+        [".START __main__\n.DATA\n    x 0\n.CODE\nDEF __main__:\n"]
+        + list(body)
+        + ["  HALT\n"]
+    )
@@ -0,0 +1,72 @@
+"""Medir o tempo de inicializacao do LogoVM.
+
+Executa `main-new.py` sobre um programa (por padrao, `counter.py`) com o
+cache de tabelas do PLY desativado, com o cache vazio e com o cache ja
+populado, e imprime o tempo de parede de cada caso.
+
+    python benchmarks/startup.py [-n REPEAT] [program]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(program, env):
+    """Executar o programa uma vez e devolver o tempo de parede."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, "main-new.py"), program],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--repeat", type=int, default=10)
+    parser.add_argument(
+        "program", nargs="?", default=os.path.join(ROOT, "counter.py")
+    )
+    options = parser.parse_args()
+
+    cache = tempfile.mkdtemp(prefix="logovm-bench-")
+    env = dict(os.environ, XDG_CACHE_HOME=cache)
+    try:
+        results = {
+            "no cache": [
+                run(options.program, dict(env, LOGOVM_PLY_CACHE="0"))
+                for _ in range(options.repeat)
+            ],
+        }
+        cold = []
+        for _ in range(options.repeat):
+            shutil.rmtree(os.path.join(cache, "logovm"), ignore_errors=True)
+            cold.append(run(options.program, env))
+        results["cold cache"] = cold
+        results["warm cache"] = [
+            run(options.program, env) for _ in range(options.repeat)
+        ]
+    finally:
+        shutil.rmtree(cache, ignore_errors=True)
+
+    for name, times in results.items():
+        print(
+            f"{name:12s} median {statistics.median(times) * 1000:8.1f} ms"
+            f"  min {min(times) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Medir o desempenho do montador, da LogoVM e da gravacao de imagens.
+
+    python benchmarks/suite.py [-n REPEAT] [-s SCALE] [-x OPTIONS]
+                               [-o FILE] [workload...]
+    python benchmarks/suite.py --compare OLD.json NEW.json
+
+Cada carga de trabalho roda REPEAT vezes, sempre em um processo novo, e
+mede separadamente a montagem (parse), a carga e ligacao (load), a
+execucao (instrucoes por segundo), a gravacao da imagem (save) e o pico
+de memoria residente. As cargas sao os exemplos do repositorio e
+programas sinteticos (recursao profunda, laco de 10^7 iteracoes e tela
+grande), cujo tamanho e multiplicado por SCALE. OPTIONS sao opcoes da
+LogoVM, como em `--vm-options="-O --no-fusion"`.
+
+Os resultados (medianas) sao gravados em JSON, por padrao em
+`benchmarks/results/<commit>.json`, para comparar com `--compare`.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS = ("parse", "load", "run", "save", "ips", "peak_rss_kb")
+
+
+def recursion(scale):
+    """Recursao de profundidade 10^5."""
+    depth = max(1, int(100_000 * scale))
+    return f"""
+.START __main__
+.DATA
+    n {depth}
+.CODE
+DEF __main__:
+  CALL down
+  HALT
+
+DEF down:
+  LOAD n
+  CMP 0
+  JZ :done
+  PUSH 1
+  SUB
+  STOR n
+  CALL down
+:done
+  RET
+"""
+
+
+def loop(scale):
+    """Laco de 10^7 iteracoes, com aritmetica e desvios."""
+    iterations = max(1, int(10_000_000 * scale))
+    return f"""
+.START __main__
+.DATA
+    counter {iterations}
+    acc 0
+.CODE
+DEF __main__:
+:while
+  LOAD counter
+  CMP 0
+  JZ :after
+  POP
+  LOAD acc
+  LOAD counter
+  ADD
+  PUSH 65535
+  AND
+  STOR acc
+  LOAD counter
+  PUSH 1
+  SUB
+  STOR counter
+  JP :while
+:after
+  HALT
+"""
+
+
+def canvas(scale):
+    """Tela de 4096x4096 com retangulos, circulos e preenchimento."""
+    side = max(64, int(4096 * scale**0.5))
+    return f"""
+.START __main__
+.INIT 0 0 {side} {side}
+.DATA
+    i 0
+.CODE
+DEF __main__:
+  PUSH 1
+  PUSH 1
+  CALL FILL
+:while
+  LOAD i
+  CMP {side // 16}
+  JZ :after
+  LOAD i
+  PUSH 16
+  MUL
+  DUP
+  PUSH {side // 8}
+  PUSH 8
+  CALL RECT
+  LOAD i
+  PUSH 16
+  MUL
+  PUSH {side // 2}
+  PUSH {side // 4}
+  CALL CIRCLE
+  LOAD i
+  PUSH 1
+  ADD
+  STOR i
+  JP :while
+:after
+  HALT
+"""
+
+
+# Nome: (arquivo do repositorio ou gerador, argumentos, entrada padrao).
+WORKLOADS = {
+    "counter": ("counter.py", [], ""),
+    "start.pixel": ("start.pixel.py", [], ""),
+    "draw": ("draw.py", [], ""),
+    "area": ("area.py", [], "10\n"),
+    "recursion": (recursion, [], ""),
+    "loop": (loop, [], ""),
+    "canvas": (canvas, [], ""),
+}
+
+
+def peak_rss_kb():
+    """Obter o pico de memoria residente do processo, em KiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(args):
+    """Executar um programa neste processo e imprimir as medidas em JSON."""
+    # pylint: disable=import-outside-toplevel
+    from logovm.main import (
+        add_internal_functions,
+        assemble,
+        create_vm,
+        init_machine,
+        link_program,
+        parse_command_line,
+    )
+
+    options = parse_command_line(args)
+    vm = create_vm(options)
+    timings = {"save": 0.0}
+    halt = vm.halt
+
+    def timed_halt():
+        start = time.perf_counter()
+        halt()
+        timings["save"] = time.perf_counter() - start
+
+    vm.halt = timed_halt
+    vm.activate()
+    add_internal_functions()
+    start = time.perf_counter()
+    entry = assemble(options.filename, options)
+    timings["parse"] = time.perf_counter() - start
+    if entry is None:
+        sys.exit(2)
+    init_machine(vm)
+    start = time.perf_counter()
+    if not link_program(vm, options):
+        sys.exit(1)
+    timings["load"] = time.perf_counter() - start
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        vm.execute(vm.symtable.get_symbol(entry))
+        elapsed = time.perf_counter() - start
+    timings["run"] = elapsed - timings["save"]
+    timings["instructions"] = vm.instructions
+    timings["ips"] = vm.instructions / timings["run"]
+    timings["peak_rss_kb"] = peak_rss_kb()
+    print(json.dumps(timings))
+
+
+def run(program, args, stdin, vm_options, image):
+    """Medir o programa uma vez, em um processo novo."""
+    process = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--measure",
+            *vm_options,
+            "--image",
+            image,
+            "--",
+            program,
+            *args,
+        ],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{program}: {process.stderr.strip()}")
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def summarize(samples):
+    """Resumir as repeticoes: medianas dos tempos e pico de memoria."""
+    summary = {
+        metric: statistics.median(sample[metric] for sample in samples)
+        for metric in ("parse", "load", "run", "save", "ips")
+    }
+    summary["instructions"] = samples[0]["instructions"]
+    rss = [sample["peak_rss_kb"] for sample in samples]
+    summary["peak_rss_kb"] = None if None in rss else max(rss)
+    return summary
+
+
+def current_commit():
+    """Obter o commit do repositorio, ou None fora de um repositorio git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new):
+    """Imprimir a razao novo/antigo de cada medida das cargas comuns."""
+    with open(old, "rt", encoding="utf-8") as source:
+        before = json.load(source)
+    with open(new, "rt", encoding="utf-8") as source:
+        after = json.load(source)
+    print(f"{before['commit']} -> {after['commit']} (new / old)")
+    print(f"{'workload':12s}" + "".join(f" {m:>11s}" for m in METRICS))
+    for name, result in after["workloads"].items():
+        if name not in before["workloads"]:
+            continue
+        row = []
+        for metric in METRICS:
+            old_value = before["workloads"][name][metric]
+            new_value = result[metric]
+            if old_value and new_value is not None:
+                row.append(f" {new_value / old_value:10.2f}x")
+            else:
+                row.append(f" {'-':>11s}")
+        print(f"{name:12s}" + "".join(row))
+
+
+def main():
+    """Ponto de entrada do benchmark."""
+    if sys.argv[1:2] == ["--measure"]:
+        measure(sys.argv[2:])
+        return
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--repeat", type=int, default=3)
+    parser.add_argument("-s", "--scale", type=float, default=1.0)
+    parser.add_argument(
+        "-x", "--vm-options", default="", help="Options for the LogoVM."
+    )
+    parser.add_argument("-o", "--output", metavar="FILE")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare results."
+    )
+    parser.add_argument(
+        "workloads", nargs="*", metavar="workload", help=", ".join(WORKLOADS)
+    )
+    options = parser.parse_args()
+    for name in options.workloads:
+        if name not in WORKLOADS:
+            parser.error(f"unknown workload: {name}")
+    if options.compare:
+        compare(*options.compare)
+        return
+
+    commit = current_commit()
+    results = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": options.scale,
+        "repeat": options.repeat,
+        "vm_options": options.vm_options,
+        "workloads": {},
+    }
+    vm_options = shlex.split(options.vm_options)
+    with tempfile.TemporaryDirectory(prefix="logovm-bench-") as workdir:
+        for name in options.workloads or WORKLOADS:
+            source, args, stdin = WORKLOADS[name]
+            if callable(source):
+                program = os.path.join(workdir, f"{name}.lasm")
+                with open(program, "wt", encoding="utf-8") as output:
+                    output.write(source(options.scale))
+            else:
+                program = os.path.join(ROOT, source)
+            image = os.path.join(workdir, name)
+            summary = summarize(
+                [
+                    run(program, args, stdin, vm_options, image)
+                    for _ in range(options.repeat)
+                ]
+            )
+            results["workloads"][name] = summary
+            print(
+                f"{name:12s} parse {summary['parse'] * 1000:8.1f} ms"
+                f"  load {summary['load'] * 1000:8.1f} ms"
+                f"  run {summary['run'] * 1000:9.1f} ms"
+                f" ({summary['ips'] / 1e6:5.2f} Mi/s)"
+                f"  save {summary['save'] * 1000:8.1f} ms"
+                f"  rss {summary['peak_rss_kb'] or 0:7d} KiB"
+            )
+
+    output = options.output or os.path.join(
+        ROOT, "benchmarks", "results", f"{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "wt", encoding="utf-8") as result_file:
+        json.dump(results, result_file, indent=2)
+    print(f"Results: {output}")
+
+
+if __name__ == "__main__":
+    main()
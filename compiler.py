@@ -0,0 +1,335 @@
+"""Compilador antecipado de LogoASM para Python.
+
+Cada procedimento DEF, ja carregado e ligado, vira uma funcao Python. A
+pilha e o registrador R0 ficam em variaveis locais, e os desvios viram
+uma maquina de estados sobre os blocos basicos do procedimento.
+Instrucoes sem traducao direta chamam o handler, ligado a LogoVM `VM`
+do programa, e R0 e R2 sao sincronizados com `reg` antes e depois dessas
+chamadas. `PUSH` e `POP` verificam os limites da pilha como a maquina.
+
+Um CALL nao chama a funcao do procedimento: a funcao retorna o
+procedimento chamado e o estado em que deve continuar, e o laco de
+`compile_program` mantem a pilha de chamadas, como a LogoVM. Assim a
+recursao do programa nao e limitada pela pilha do Python.
+"""
+
+import hashlib
+import logging
+import os
+
+from logovm import rom
+from logovm.errors import EmptyStackError, InvalidAddress, StackOverflowError
+from logovm.logovm import cmds, compare_variable, unbound
+from logovm.machinery import MAXSTACKSIZE
+
+BINOPS = {
+    "ADD": "+",
+    "SUB": "-",
+    "MUL": "*",
+    "DIV": "/",
+    "POW": "**",
+    "AND": "&",
+    "OR": "|",
+    "XOR": "^",
+    "SHFTR": ">>",
+    "SHFTL": "<<",
+}
+CONDITIONS = {"JZ": "==", "JNZ": "!=", "JMORE": ">", "JLESS": "<"}
+TERMINATORS = ("JP", "JR", "RET", "HALT")
+HEADER = "# LogoVM compiled program v4: sha256="
+NUMBERS = "(int, float)"
+# Acesso a pilha com as verificacoes de Machine.stack_push/stack_pop.
+STACK_ACCESS = """
+
+def PUSH(value):
+    if len(STACK) >= MAXSTACKSIZE:
+        raise StackOverflowError()
+    STACK.append(value)
+
+
+def POP():
+    if not STACK:
+        raise EmptyStackError()
+    return STACK.pop()"""
+
+
+class Halt(Exception):
+    """Desfazer as chamadas compiladas quando o programa executa HALT."""
+
+
+def is_terminator(instruction):
+    """Verificar se a instrucao encerra o bloco basico."""
+    opcode, _, args = instruction
+    return opcode in TERMINATORS or (opcode == "CALL" and bool(args))
+
+
+def block_leaders(code):
+    """Obter o inicio de cada bloco basico do procedimento."""
+    leaders = {0}
+    for pc, (opcode, _, args) in enumerate(code):
+        if opcode == "JP" or opcode in CONDITIONS:
+            leaders.update((args[0] + 1, pc + 1))
+        elif opcode == "JR":
+            leaders.update((pc + args[0] + 1, pc + 1))
+        elif opcode in ("SKIPZ", "SKIPNZ"):
+            leaders.update((pc + 1, pc + 2))
+        elif opcode in ("RET", "HALT") or (opcode == "CALL" and args):
+            leaders.add(pc + 1)
+    return sorted(pc for pc in leaders if 0 <= pc < len(code))
+
+
+class Compiler:
+    """Gerar o codigo Python de um programa LogoASM ligado."""
+
+    def __init__(self, vm):
+        """Inicializar nomes de funcoes e variaveis do programa."""
+        self.vm = vm
+        symtable = vm.symtable
+        self.functions = {
+            name: f"f_{index}"
+            for index, name in enumerate(symtable.get_symbols_by_class("FUNC"))
+        }
+        self.variables = {
+            data["slot"]: f"v_{data['slot']}"
+            for data in symtable.get_symbols_by_class("VAR").values()
+        }
+        self.handlers = set()
+        # Registradores mantidos em variaveis locais no procedimento atual.
+        self.registers = ("0",)
+
+    def save_registers(self):
+        """Copiar para `reg` os registradores locais."""
+        return [f"reg[{n}] = r{n}" for n in self.registers]
+
+    def load_registers(self):
+        """Copiar de `reg` os registradores locais."""
+        return [f"r{n} = reg[{n}]" for n in self.registers]
+
+    def fallback(self, name, expr):
+        """Chamar um handler da LogoVM, sincronizando os registradores."""
+        self.handlers.add((name, expr))
+        return [*self.save_registers(), f"{name}()", *self.load_registers()]
+
+    def instruction(self, pc, instruction, jump):
+        """Traduzir uma instrucao; `jump(pc)` gera o desvio para `pc`."""
+        opcode, handler, args = instruction
+        if opcode == "PUSH":
+            return [f"push({args[0]!r})"]
+        if opcode == "POP":
+            return ["r0 = pop()"]
+        if opcode == "DUP":
+            return ["r0 = pop()", "push(r0)", "push(r0)"]
+        if opcode == "LOAD":
+            return [f"r0 = {self.variables[args[0]]}", "push(r0)"]
+        if opcode == "STOR":
+            return [f"r0 = {self.variables[args[0]]} = pop()"]
+        if opcode in BINOPS:
+            operation = f"r0 = pop() {BINOPS[opcode]} r2"
+            return ["r2 = pop()", operation, "push(r0)"]
+        if opcode == "CMP":
+            if unbound(handler) is compare_variable:
+                rhs = self.variables[args[0]]
+                guard = (
+                    f"isinstance(lhs, {NUMBERS}) and "
+                    f"isinstance({rhs}, {NUMBERS}) or "
+                    f"isinstance(lhs, str) and isinstance({rhs}, str)"
+                )
+            else:
+                rhs = repr(args[0])
+                if isinstance(args[0], str):
+                    guard = "isinstance(lhs, str)"
+                else:
+                    guard = f"isinstance(lhs, {NUMBERS})"
+            # Pilha vazia ou tipos diferentes: o handler relata o erro.
+            mismatch = self.fallback("op_CMP", "cmds['CMP']")
+            mismatch[len(self.registers)] = f"op_CMP({rhs})"
+            return [
+                "lhs = stack[-1] if stack else None",
+                f"if {guard}:",
+                f"    r0 = -2 if lhs < {rhs} else 2 if lhs > {rhs} else 0",
+                "else:",
+                *(f"    {line}" for line in mismatch),
+            ]
+        if opcode == "JP":
+            return jump(args[0] + 1)
+        if opcode in CONDITIONS:
+            return [f"if r0 {CONDITIONS[opcode]} 0:", *(
+                f"    {line}" for line in jump(args[0] + 1)
+            )]
+        if opcode == "JR":
+            return jump(pc + args[0] + 1)
+        if opcode in ("SKIPZ", "SKIPNZ"):
+            test = "==" if opcode == "SKIPZ" else "!="
+            return [f"if r0 {test} 0:", *(
+                f"    {line}" for line in jump(pc + 2)
+            )]
+        if opcode == "LABEL":
+            return []
+        if opcode == "RET":
+            return [*self.save_registers(), "return"]
+        if opcode == "HALT":
+            self.handlers.add(("op_HALT", "cmds['HALT']"))
+            return [*self.save_registers(), "op_HALT()", "raise Halt"]
+        if opcode == "CALL":
+            if args:
+                callee = self.functions[args[0]["name"]]
+                return [*self.save_registers(), f"return {callee}, {pc + 1}"]
+            name = next(
+                k for k, v in rom.internal.items() if v is unbound(handler)
+            )
+            return self.fallback(f"rom_{name}", f"rom.internal[{name!r}]")
+        lines = self.fallback(f"op_{opcode}", f"cmds[{opcode!r}]")
+        lines[len(self.registers)] = f"op_{opcode}(*{args!r})"
+        return lines
+
+    def function(self, name, code):
+        """Traduzir um procedimento em uma funcao Python."""
+        body = []
+        # R2 so fica em variavel local se o procedimento tem operacoes.
+        if any(opcode in BINOPS for opcode, _, _ in code):
+            self.registers = ("0", "2")
+        else:
+            self.registers = ("0",)
+        leaders = block_leaders(code)
+        blocks = list(zip(leaders, leaders[1:] + [len(code)]))
+        # Um procedimento que chama outro precisa continuar apos o CALL.
+        single = len(blocks) == 1 and not (
+            code[-1][0] == "CALL" and code[-1][2]
+        )
+
+        def jump(target):
+            return [f"state = {target}", "continue"]
+
+        for start, end in blocks:
+            lines = []
+            for pc in range(start, end):
+                lines.extend(self.instruction(pc, code[pc], jump))
+            if not is_terminator(code[end - 1]):
+                if end == len(code):
+                    lines.append(f"raise InvalidAddress({end})")
+                elif not single:
+                    lines.append(f"state = {end}")
+            if single:
+                body.extend(lines)
+            else:
+                body.append(f"if state == {start}:")
+                body.extend(f"    {line}" for line in lines or ["pass"])
+        if not single:
+            body = [
+                "while True:",
+                *(f"    {line}" for line in body),
+                "    raise InvalidAddress(state)",
+            ]
+        header = [f"def {self.functions[name]}(state):  # {name}"]
+        if self.variables:
+            header.append(f"    global {', '.join(self.variables.values())}")
+        header.extend(
+            [
+                "    stack = STACK",
+                "    push = PUSH",
+                "    pop = POP",
+                "    reg = REG",
+                *(f"    {line}" for line in self.load_registers()),
+            ]
+        )
+        return header + [f"    {line}" for line in body]
+
+    def program(self, start, checksum):
+        """Gerar o modulo Python do programa completo."""
+        symtable = self.vm.symtable
+        functions = []
+        for name, data in symtable.get_symbols_by_class("FUNC").items():
+            functions.extend(["", ""] + self.function(name, data["ops"]))
+        lines = [
+            f"{HEADER}{checksum}",
+            "STACK = VM.stack",
+            "REG = VM.reg",
+        ]
+        lines.extend(STACK_ACCESS.splitlines())
+        lines.append("")
+        lines.extend(
+            f"{k} = {v}.__get__(VM)" for k, v in sorted(self.handlers)
+        )
+        names = {
+            data["slot"]: name
+            for name, data in symtable.get_symbols_by_class("VAR").items()
+        }
+        for slot, var in self.variables.items():
+            value = self.vm.memory[slot]
+            lines.append(f"{var} = {value!r}  # {names[slot]}")
+        lines.extend(functions)
+        lines.extend(["", "", f"main = {self.functions[start]}", ""])
+        return "\n".join(lines)
+
+
+def __checksum(vm, start):
+    """Calcular o hash do programa ligado: codigo, variaveis e inicio.
+
+    O codigo e o que a VM executaria, depois da ligacao dos modulos, do
+    otimizador e da fusao de instrucoes.
+    """
+    symtable = vm.symtable
+    digest = hashlib.sha256(f"{HEADER}{start}\n".encode())
+    for name, data in symtable.get_symbols_by_class("FUNC").items():
+        digest.update(f"DEF {name}\n".encode())
+        for opcode, handler, args in data["ops"]:
+            if opcode == "CALL" and args:
+                args = (args[0]["name"],)
+            handler = getattr(unbound(handler), "__qualname__", "")
+            digest.update(f"{opcode} {handler} {args!r}\n".encode())
+    for name, data in symtable.get_symbols_by_class("VAR").items():
+        value = vm.memory[data["slot"]]
+        digest.update(f"VAR {name} {data['slot']} {value!r}\n".encode())
+    return digest.hexdigest()
+
+
+def compile_program(vm, start, filename, cache=False):
+    """Compilar o programa carregado na VM, devolvendo sua entrada."""
+    checksum = __checksum(vm, start)
+    compiler = Compiler(vm)
+    cache_file = f"{filename}.lvm.py"
+    source = None
+    if cache and os.path.exists(cache_file):
+        with open(cache_file, "rt", encoding="utf-8") as cached:
+            source = cached.read()
+        if not source.startswith(f"{HEADER}{checksum}"):
+            logging.info("Stale compiled cache: %s", cache_file)
+            source = None
+    if source is None:
+        source = compiler.program(start, checksum)
+        if cache:
+            with open(cache_file, "wt", encoding="utf-8") as cached:
+                cached.write(source)
+    logging.debug("COMPILED:\n%s", source)
+    namespace = {
+        "VM": vm,
+        "rom": rom,
+        "cmds": cmds,
+        "Halt": Halt,
+        "InvalidAddress": InvalidAddress,
+        "EmptyStackError": EmptyStackError,
+        "StackOverflowError": StackOverflowError,
+        "MAXSTACKSIZE": MAXSTACKSIZE,
+    }
+    exec(compile(source, cache_file, "exec"), namespace)
+
+    def run():
+        frames = []
+        function, state = namespace["main"], 0
+        try:
+            while True:
+                call = function(state)
+                if call is not None:
+                    frames.append((function, call[1]))
+                    function, state = call[0], 0
+                elif frames:
+                    function, state = frames.pop()
+                else:
+                    break
+        except Halt:
+            pass
+        finally:
+            for slot, var in compiler.variables.items():
+                vm.memory[slot] = namespace[var]
+
+    return run
@@ -0,0 +1,60 @@
+"""Desmontador de arquivos objeto `.lbo` do LogoASM."""
+
+import argparse
+import sys
+
+from logoasm.objfile import read_object
+
+
+def disassemble(obj, out=sys.stdout):
+    """Imprimir as secoes e o codigo de um ObjectFile."""
+    print(f".START {obj.start}", file=out)
+    print(f"; {len(obj.lines)} instructions", file=out)
+    print(f"; {len(obj.relocations)} relocations", file=out)
+    print(f"; {len(obj.constants)} constants", file=out)
+    for index, constant in enumerate(obj.constants):
+        print(f";   #{index:<5d} {constant!r}", file=out)
+    print(f"; {len(obj.symbols)} symbols", file=out)
+    for index, symbol in enumerate(obj.symbols):
+        attrs = " ".join(
+            f"{k}={v!r}"
+            for k, v in symbol.items()
+            if k not in ("name", "type", "code")
+        )
+        print(
+            f";   @{index:<5d} {symbol['type']:6s} {symbol['name']} {attrs}",
+            file=out,
+        )
+    for symbol in obj.symbols:
+        if "code" not in symbol:
+            continue
+        start, end = symbol["code"]
+        print(f"\nDEF {symbol['name']}:", file=out)
+        for index in range(start, end):
+            operand = obj.code[2 * index + 1]
+            if operand < 0:
+                ref = ""
+            elif index in obj.relocated:
+                ref = f"@{operand}"
+            else:
+                ref = f"#{operand}"
+            print(
+                f"  {index - start:6d} {ref:>7s}  {obj.instruction(index):40s}"
+                f" ; line {obj.lines[index]}",
+                file=out,
+            )
+
+
+def main():
+    """Ponto de entrada do desmontador."""
+    parser = argparse.ArgumentParser(
+        prog="disasm", description="Disassemble LogoVM object files."
+    )
+    parser.add_argument("filename", help="LogoVM object file (.lbo).")
+    options = parser.parse_args()
+    disassemble(read_object(options.filename))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Gravacao de quadros de animacao da LogoVM.
+
+A rotina FRAME envia ao gravador apenas a regiao da memoria de video
+alterada desde o quadro anterior. O gravador mantem sua propria copia da
+tela e codifica os quadros em uma thread separada, alimentada por uma
+fila limitada: a VM so espera quando a fila esta cheia.
+
+Se o destino termina em `.gif`, os quadros formam um GIF animado,
+escrito pela thread a medida que chegam: cada quadro guarda apenas a
+regiao alterada, e quadros sem alteracao somam a sua duracao a do
+anterior. Caso contrario, cada quadro e salvo como
+`<destino>-NNNN.<formato>`.
+"""
+
+import logging
+import queue
+import threading
+
+from logovm.machinery import save_netpbm
+
+try:
+    from PIL import GifImagePlugin, Image
+except ImportError:
+    HAS_PIL_IMAGE = False
+else:
+    HAS_PIL_IMAGE = True
+
+QUEUE_SIZE = 16
+
+
+class FrameRecorder:
+    """Codificar em segundo plano os quadros enviados pela VM."""
+
+    def __init__(self, target, width, height, bpp, **kwargs):
+        """Inicializar a tela do gravador e iniciar a thread."""
+        self.target = target
+        self.width, self.height, self.bpp = width, height, bpp
+        self.image_format = kwargs.get("image_format", "png").lower()
+        self.delay = kwargs.get("delay", 100)
+        self.canvas = bytearray(width * height * bpp)
+        self.count = 0
+        self.error = None
+        # GIF aberto e quadro ainda nao escrito: (imagem, posicao, duracao).
+        self.output = None
+        self.pending = None
+        self.gif = target.lower().endswith(".gif")
+        if self.gif and not HAS_PIL_IMAGE:
+            raise RuntimeError("GIF output requires the PIL module.")
+        if not HAS_PIL_IMAGE or self.image_format not in ("png", "jpg"):
+            self.image_format = "pgm" if bpp == 1 else "ppm"
+        self.queue = queue.Queue(kwargs.get("queue_size", QUEUE_SIZE))
+        self.thread = threading.Thread(
+            target=self.worker, name="frame-encoder", daemon=True
+        )
+        self.thread.start()
+
+    def push(self, box, rows):
+        """Enfileirar um quadro: linhas `rows` da regiao `box` alterada."""
+        if self.error is not None:
+            raise self.error
+        self.queue.put((box, rows))
+
+    def worker(self):
+        """Consumir a fila ate receber o sinal de fim (`None`)."""
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                break
+            if self.error is None:
+                try:
+                    self.encode(*frame)
+                except Exception as error:  # pylint: disable=broad-except
+                    self.error = error
+        if self.output is not None:
+            try:
+                if self.error is None:
+                    self.write_gif_frame()
+                    self.output.write(b";")
+            except Exception as error:  # pylint: disable=broad-except
+                self.error = error
+            finally:
+                self.output.close()
+
+    def encode(self, box, rows):
+        """Aplicar a regiao alterada a tela e codificar o quadro."""
+        stride = self.width * self.bpp
+        if box is not None:
+            x0, y0, x1, _ = box
+            start, end = x0 * self.bpp, x1 * self.bpp
+            for j, data in enumerate(rows, y0):
+                self.canvas[j * stride + start : j * stride + end] = data
+        self.count += 1
+        size = (self.width, self.height)
+        mode = "L" if self.bpp == 1 else "RGB"
+        if self.gif:
+            self.add_gif_frame(box, rows, mode)
+            return
+        filename = f"{self.target}-{self.count:04d}.{self.image_format}"
+        logging.debug("Saving frame: %s", filename)
+        if self.image_format in ("pgm", "ppm"):
+            magic = "P5" if self.bpp == 1 else "P6"
+            save_netpbm(filename, magic, *size, self.canvas)
+        else:
+            Image.frombytes(mode, size, bytes(self.canvas)).save(filename)
+
+    def add_gif_frame(self, box, rows, mode):
+        """Escrever o quadro pendente e guardar a regiao alterada."""
+        if self.output is None:
+            image = Image.frombytes(
+                mode, (self.width, self.height), bytes(self.canvas)
+            )
+            header, _ = GifImagePlugin.getheader(
+                self.gif_image(image), info={"loop": 0}
+            )
+            self.output = open(self.target, "wb")
+            self.output.write(b"".join(header))
+            self.pending = (image, (0, 0), self.delay)
+            return
+        if box is None:
+            image, offset, delay = self.pending
+            self.pending = (image, offset, delay + self.delay)
+            return
+        x0, y0, x1, y1 = box
+        image = Image.frombytes(mode, (x1 - x0, y1 - y0), b"".join(rows))
+        self.write_gif_frame()
+        self.pending = (image, (x0, y0), self.delay)
+
+    @staticmethod
+    def gif_image(image):
+        """Converter a imagem para o modo de paleta do GIF."""
+        if image.mode == "RGB":
+            return image.convert("P", palette=Image.Palette.ADAPTIVE)
+        return image
+
+    def write_gif_frame(self):
+        """Escrever no GIF o quadro pendente, com paleta propria se RGB."""
+        image, offset, delay = self.pending
+        image = self.gif_image(image)
+        params = {"duration": delay}
+        if image.mode == "P":
+            params["include_color_table"] = True
+        for data in GifImagePlugin.getdata(image, offset, **params):
+            self.output.write(data)
+
+    def close(self):
+        """Esperar a codificacao dos quadros pendentes e finalizar."""
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+        if self.error is not None:
+            raise self.error
+        logging.info("Saved %d frames: %s", self.count, self.target)
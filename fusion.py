@@ -0,0 +1,159 @@
+"""Superinstrucoes da LogoVM.
+
+Uma superinstrucao executa uma sequencia de instrucoes ja ligadas com um
+unico despacho. A primeira instrucao da sequencia recebe o handler
+fundido, que executa a sequencia inteira e avanca o PC para depois dela;
+as demais continuam no lugar, de modo que desvios para o meio da
+sequencia, e a instrucao saltada por SKIPZ/SKIPNZ, seguem validos.
+
+Fusoes especializadas:
+
+    LOAD x; PUSH n; ADD|SUB; STOR x       -> update_variable
+    LOAD x; CMP n; JZ|JNZ|JMORE|JLESS L   -> compare_variable_branch
+
+Outras sequencias sem desvios (por exemplo, as propostas por
+`logovm.ngrams`) sao executadas por `run_sequence`.
+
+O laco de `execute` conta um despacho por superinstrucao; cada uma soma
+a `vm.instructions` as demais instrucoes da sequencia, para que a
+contagem nao dependa das fusoes instaladas.
+"""
+
+import json
+import operator
+
+from logovm.logovm import (
+    Instruction,
+    call,
+    compare,
+    jump,
+    tail_call,
+    unbound,
+)
+
+CONDITIONS = {
+    "JZ": operator.eq,
+    "JNZ": operator.ne,
+    "JMORE": operator.gt,
+    "JLESS": operator.lt,
+}
+UPDATES = {"ADD": operator.add, "SUB": operator.sub}
+CONTROL = ("JP", "JR", "SKIPZ", "SKIPNZ", "RET", "HALT", *CONDITIONS)
+SPECIALIZED = [
+    ("LOAD", "PUSH", operation, "STOR") for operation in UPDATES
+] + [("LOAD", "CMP", condition) for condition in CONDITIONS]
+
+
+def update_variable(vm, slot, operation, value):
+    """Superinstrucao: LOAD x; PUSH n; ADD|SUB; STOR x."""
+    reg, memory = vm.reg, vm.memory
+    reg[2] = value
+    reg[0] = memory[slot] = operation(memory[slot], value)
+    vm.pc_stack[-1] += 3
+    vm.instructions += 3
+
+
+def compare_variable_branch(vm, slot, rhs, test, target):
+    """Superinstrucao: LOAD x; CMP n; JZ|JNZ|JMORE|JLESS L."""
+    vm.stack_push(vm.memory[slot])
+    compare(vm, rhs)
+    vm.instructions += 2
+    if test(vm.reg[0], 0):
+        jump(vm, target)
+    else:
+        vm.pc_stack[-1] += 2
+
+
+def run_sequence(vm, steps, skip):
+    """Superinstrucao generica: executar os handlers em sequencia."""
+    for handler, args in steps:
+        handler(*args)
+    vm.pc_stack[-1] += skip
+    vm.instructions += skip
+
+
+def __update(vm, ops):
+    """Fundir LOAD x; PUSH n; ADD|SUB; STOR x."""
+    if len(ops) < 4:
+        return None
+    load, push, update, store = ops[:4]
+    if (
+        (load.opcode, push.opcode, store.opcode) != ("LOAD", "PUSH", "STOR")
+        or update.opcode not in UPDATES
+        or load.args != store.args
+    ):
+        return None
+    args = (load.args[0], UPDATES[update.opcode], push.args[0])
+    return vm.bind(update_variable), args, 4
+
+
+def __branch(vm, ops):
+    """Fundir LOAD x; CMP n; Jcc L, com CMP contra uma constante."""
+    if len(ops) < 3:
+        return None
+    load, cmp, branch = ops[:3]
+    if (
+        (load.opcode, cmp.opcode) != ("LOAD", "CMP")
+        or unbound(cmp.handler) is not compare
+        or branch.opcode not in CONDITIONS
+    ):
+        return None
+    args = (load.args[0], cmp.args[0], CONDITIONS[branch.opcode])
+    return vm.bind(compare_variable_branch), (*args, branch.args[0]), 3
+
+
+def straight(instruction):
+    """Verificar se a instrucao nunca desvia nem troca de quadro."""
+    return instruction.opcode not in CONTROL and unbound(
+        instruction.handler
+    ) not in (call, tail_call)
+
+
+def __sequence(vm, ops, sequences):
+    """Fundir a maior sequencia generica que casa com o inicio de `ops`."""
+    for sequence in sequences:
+        window = ops[: len(sequence)]
+        if tuple(op.opcode for op in window) == sequence and all(
+            straight(op) for op in window
+        ):
+            steps = tuple((op.handler, op.args) for op in window)
+            return vm.bind(run_sequence), (steps, len(window) - 1), len(window)
+    return None
+
+
+def load_sequences(filename):
+    """Ler as sequencias de um arquivo gerado por `logovm.ngrams`."""
+    with open(filename, "rt", encoding="utf-8") as source:
+        return [tuple(sequence) for sequence in json.load(source)["sequences"]]
+
+
+def fuse(vm, sequences=()):
+    """Instalar superinstrucoes nos procedimentos ligados da VM.
+
+    Devolve o numero de superinstrucoes instaladas.
+    """
+    sequences = sorted(
+        {tuple(s) for s in sequences if len(s) > 1}, key=len, reverse=True
+    )
+    count = 0
+    symtable = vm.symtable
+    for name, data in symtable.get_symbols_by_class("FUNC").items():
+        ops = list(data["ops"])
+        pc = 0
+        while pc < len(ops):
+            window = ops[pc : pc + 4]
+            fused = (
+                __update(vm, window)
+                or __branch(vm, window)
+                or __sequence(vm, ops[pc:], sequences)
+            )
+            if fused is None:
+                pc += 1
+                continue
+            handler, args, size = fused
+            opcode = "+".join(op.opcode for op in ops[pc : pc + size])
+            ops[pc] = Instruction(opcode, handler, args)
+            count += 1
+            pc += size
+        symtable.set_symbol(name, ops=ops)
+    return count
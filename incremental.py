@@ -0,0 +1,152 @@
+"""Montagem incremental de programas LogoASM, para o modo `--watch`.
+
+O montador guarda, entre as montagens, o cabecalho do programa (`.START`,
+`.INIT`, `.IMPORT`, `.DATA` e `.CODE`) e o resultado de cada bloco `DEF`,
+indexado pelo texto do bloco. Quando o arquivo muda, so os blocos cujo
+texto mudou sao montados de novo, todos de uma vez, no lugar em que estao
+(as linhas dos outros blocos sao trocadas por linhas vazias, para manter
+os numeros das linhas); os demais sao reaproveitados, deslocados para a
+sua nova posicao.
+
+A tabela de simbolos e refeita a cada montagem, a partir do cabecalho e
+dos blocos, como na montagem paralela: as etiquetas, as contagens de uso
+e os enderecos dos procedimentos sao globais, e refaze-los e mais barato
+do que desfazer as alteracoes de cada bloco. Se o cabecalho mudar, todos
+os blocos sao montados de novo; se algum bloco falhar, o programa e
+montado por inteiro, para relatar o erro como sempre.
+"""
+
+import bisect
+import io
+import logging
+import os
+
+from logoasm import parallel
+from logoasm.linker import link_modules
+from logoasm.parser import check_references
+
+
+def discard_record(record):
+    """Filtro de logging que descarta todos os registros."""
+    return False
+
+
+class IncrementalAssembler:
+    """Montador que reaproveita os blocos DEF que nao mudaram."""
+
+    def __init__(self, filename, tokenizer="ply", parser_name="ply"):
+        """Inicializar o montador de `filename`, sem blocos montados."""
+        self.filename = filename
+        self.tokenizer = tokenizer
+        self.parser_name = parser_name
+        self.header = None
+        # Texto do bloco -> procedimentos, com linhas relativas ao bloco.
+        self.blocks = {}
+        # Caminhos dos modulos importados na ultima ligacao.
+        self.modules = set()
+
+    def __parse(self, source):
+        return parallel.parse_source(source, self.tokenizer, self.parser_name)
+
+    def __assemble(self, lines, header, changed):
+        """Montar os blocos `changed` e guardar os seus procedimentos."""
+        text = lines[:]
+        kept = set(range(len(header), len(lines)))
+        for begin, end in changed:
+            kept.difference_update(range(begin, end))
+        for index in kept:
+            text[index] = "\n"
+        # Os erros sao relatados pela montagem completa. O montador registra
+        # pelo logger raiz; um filtro nele nao altera o logging.disable.
+        logging.root.addFilter(discard_record)
+        try:
+            procedures = parallel.assemble_chunk(
+                (
+                    self.tokenizer,
+                    self.parser_name,
+                    parallel.initial_table(),
+                    "",
+                    0,
+                    "".join(text),
+                )
+            )
+        finally:
+            logging.root.removeFilter(discard_record)
+        if procedures is None:
+            return False
+        begins = [begin for begin, _ in changed]
+        results = [[] for _ in changed]
+        for lineno, name, code, code_lines in procedures:
+            # O DEF do bloco que comeca no indice `begin` esta na linha
+            # `begin + 1`.
+            block = bisect.bisect_right(begins, lineno - 1) - 1
+            begin = begins[block]
+            results[block].append(
+                (
+                    lineno - begin,
+                    name,
+                    code,
+                    [line - begin for line in code_lines],
+                )
+            )
+        for (begin, end), result in zip(changed, results):
+            self.blocks["".join(lines[begin:end])] = result
+        return True
+
+    def __parse_serial(self):
+        return parallel.parse_serial(
+            self.filename, self.tokenizer, self.parser_name
+        )
+
+    def parse_program(self):
+        """Montar o programa, reaproveitando os blocos que nao mudaram."""
+        with open(self.filename, "rt") as input_file:
+            lines = input_file.readlines()
+        blocks = parallel.definitions(lines)
+        if not blocks:
+            return self.__parse_serial()
+        header = lines[: blocks[0][0]]
+        header_text = "".join(header)
+        if header_text != self.header:
+            self.header = header_text
+            self.blocks = {}
+        texts = ["".join(lines[begin:end]) for begin, end in blocks]
+        if len(set(texts)) < len(texts):
+            # Blocos repetidos: o erro e relatado pela montagem completa.
+            return self.__parse_serial()
+        changed = [
+            block
+            for block, text in zip(blocks, texts)
+            if text not in self.blocks
+        ]
+        if changed and not self.__assemble(lines, header, changed):
+            # Os blocos que ja estavam montados continuam validos.
+            logging.info("Watch: assembly failed, assembling serially.")
+            return self.__parse_serial()
+        # Descartar os blocos que sairam do programa.
+        self.blocks = {text: self.blocks[text] for text in texts}
+        logging.info(
+            "Watch: %d of %d blocks assembled.", len(changed), len(blocks)
+        )
+
+        start_symbol = self.__parse(io.StringIO(header_text))
+        for (begin, _), text in zip(blocks, texts):
+            parallel.merge_procedures(
+                [
+                    (
+                        lineno + begin,
+                        name,
+                        code,
+                        [line + begin for line in code_lines],
+                    )
+                    for lineno, name, code, code_lines in self.blocks[text]
+                ]
+            )
+        modules = set()
+        try:
+            link_modules(self.filename, start_symbol, self.__parse, modules)
+        finally:
+            modules.discard(os.path.realpath(self.filename))
+            self.modules = modules
+        check_references()
+        return start_symbol
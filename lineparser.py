@@ -0,0 +1,393 @@
+"""Montador LogoASM escrito a mao, alternativo ao parser do PLY.
+
+O LogoASM e orientado a linhas: quase toda linha e uma instrucao com no
+maximo um operando, separados por espacos. As palavras de cada linha sao
+classificadas diretamente; as linhas com strings, comentarios ou palavras
+que nao formam um token inteiro (como em `DEF nome:`) passam pelo lexer
+rapido (`logoasm.scanner`). A gramatica de `logoasm.parser` e reconhecida
+por descida recursiva, com uma tabela das acoes de cada instrucao, e as
+operacoes sobre a tabela de simbolos sao as mesmas e na mesma ordem: os
+dois parsers produzem os mesmos simbolos e as mesmas listas de codigo.
+"""
+
+import logging
+import re
+
+from logoasm.linker import add_import, link_modules
+from logoasm.parser import ParserObject, check_references
+from logoasm.scanner import KEYWORDS, Scanner
+from logoasm.symtable import (
+    add_symbol,
+    set_symbol,
+    get_symbol,
+    increment_symbol_usage,
+)
+
+WORDS = re.compile(r"[^ \t\r\n]+").findall
+ID = re.compile(r"[_@a-zA-Z][_@.a-zA-Z0-9]*").fullmatch
+LABEL = re.compile(r"[:][_@a-zA-Z][_@.a-zA-Z0-9]*").fullmatch
+NUMBER = re.compile(r"[+-]?\d+(?:[.]\d*)?").fullmatch
+# Palavras reservadas e diretivas mais comuns: palavra -> (tipo, valor).
+RESERVED = {
+    **{word: (word, word) for word in KEYWORDS},
+    **{word.lower(): (word, word.lower()) for word in KEYWORDS},
+    **{
+        f".{word}": (word, word)
+        for word in ("CODE", "DATA", "START", "INIT", "IMPORT")
+    },
+}
+END = "$end"
+
+
+class InvalidToken(Exception):
+    """Erro de sintaxe: o token nao pode ocorrer nesta posicao."""
+
+    def __init__(self, token):
+        """Inicializar o erro com o token (tipo, valor, linha)."""
+        super().__init__(f"Invalid token:{token[2]}: {token[0]}:'{token[1]}'")
+        self.token = token
+
+
+def tokenize(source):
+    """Gerar os tokens (tipo, valor, linha) das linhas de `source`."""
+    reserved = RESERVED
+    scanner = Scanner()
+    lineno = 0
+    for lineno, line in enumerate(source, 1):
+        tokens = []
+        for word in WORDS(line):
+            token = reserved.get(word)
+            if token is not None:
+                tokens.append((*token, lineno))
+            elif word[0] == "#":
+                break
+            elif ID(word) or word[-1] == ":" and ID(word[:-1]):
+                # Identificador, talvez seguido de ':', como em `DEF nome:`.
+                name = word[:-1] if word[-1] == ":" else word
+                upper = name.upper()
+                kind = upper if upper in KEYWORDS else "ID"
+                tokens.append((kind, name, lineno))
+                if name is not word:
+                    tokens.append(("COLON", ":", lineno))
+            elif NUMBER(word):
+                value = float(word) if "." in word else int(word)
+                tokens.append(("NUMBER", value, lineno))
+            elif LABEL(word):
+                tokens.append(("LABEL", word[1:], lineno))
+            else:
+                scanner.lineno = lineno
+                scanner.input(line)
+                tokens = [(tok.type, tok.value, lineno) for tok in scanner]
+                break
+        yield from tokens
+    yield (END, None, lineno)
+
+
+# Acoes sobre a tabela de simbolos, iguais as de `logoasm.parser`.
+
+
+def call(name, lineno):
+    """Registrar uma chamada (CALL) do procedimento `name`."""
+    function = get_symbol(name)
+    if not function:
+        add_symbol(name, "FUNC", code=None, usage=1)
+    elif function["type"] not in ["FUNC", "INT"]:
+        raise Exception(
+            f"Unexpected symbol type:'FUNC or INT':'{function['type']}' "
+        )
+    increment_symbol_usage(name, lineno)
+
+
+def jump(label, lineno):
+    """Registrar um desvio para a etiqueta `label`."""
+    symbol = get_symbol(label)
+    if symbol:
+        if symbol["type"] != "LABEL":
+            raise Exception(f"Unexpected Symbol Type:{lineno}: '{label}'")
+        increment_symbol_usage(label, lineno)
+    else:
+        add_symbol(label, "LABEL", usage=1)
+
+
+def define_label(name, lineno):
+    """Definir a etiqueta `name` na linha `lineno`."""
+    sym = get_symbol(name)
+    if sym is None:
+        add_symbol(name, "LABEL", lineno=lineno, usage=0)
+    else:
+        if sym["type"] != "LABEL":
+            raise Exception(f"Not a label:{lineno}: '{name}'")
+        set_symbol(name, lineno=lineno)
+    logging.debug(
+        "LABEL: %d: '%s' (%s)", lineno, name, "used" if sym else "unused"
+    )
+
+
+def define_procedure(name, lineno, code, lines):
+    """Definir o procedimento `name`, com seu codigo e suas linhas."""
+    logging.log(5, "Procedure: %s", name)
+    if get_symbol(name) is None:
+        add_symbol(
+            name, "FUNC", lineno=lineno, code=code, lines=lines, usage=0
+        )
+    else:
+        set_symbol(name, lineno=lineno, code=code, lines=lines)
+
+
+class LineParser:
+    """Parser descendente recursivo do LogoASM."""
+
+    def __init__(self, source):
+        """Inicializar o parser sobre as linhas de `source`."""
+        self.__tokens = tokenize(source)
+        self.token = next(self.__tokens)
+        single = self.__single
+        jump = self.__jump
+        flag = self.__flag
+        self.__statements = {
+            "LOAD": self.__variable,
+            "STOR": self.__variable,
+            "PUSH": self.__push,
+            "PUSHF": single,
+            "POP": single,
+            "CALL": self.__call,
+            "RET": single,
+            "HALT": single,
+            "CMP": self.__compare,
+            "JP": jump,
+            "JZ": jump,
+            "JNZ": jump,
+            "JMORE": jump,
+            "JLESS": jump,
+            "SKIPZ": single,
+            "SKIPNZ": single,
+            "LABEL": self.__label,
+            "DUP": single,
+            "SET": flag,
+            "UNSET": flag,
+            "MVTO": self.__draw,
+            "SETPX": self.__draw,
+            **dict.fromkeys(
+                (
+                    "ADD",
+                    "SUB",
+                    "MUL",
+                    "DIV",
+                    "IDIV",
+                    "POW",
+                    "TRUNC",
+                    "RAND",
+                    "AND",
+                    "OR",
+                    "XOR",
+                    "SHFTR",
+                    "SHFTL",
+                    "NOT",
+                ),
+                single,
+            ),
+        }
+
+    def __next(self, *kinds):
+        """Consumir o token corrente, que deve ser de um dos tipos dados."""
+        token = self.token
+        if token[0] not in kinds:
+            raise InvalidToken(token)
+        self.token = next(self.__tokens)
+        return token
+
+    def program(self):
+        """Reconhecer o programa e retornar o simbolo inicial."""
+        try:
+            start = self.__start()
+            self.__init_directive()
+            self.__imports()
+            self.__data()
+            self.__code()
+        except InvalidToken as error:
+            kind, value, lineno = error.token
+            if kind == END:
+                logging.error("Syntax error at EOF.")
+            else:
+                logging.critical(
+                    "Invalid token:%d: %s:'%s'", lineno, kind, value
+                )
+            return None
+        return start
+
+    def __start(self):
+        """start : START ID | empty"""
+        if self.token[0] != "START":
+            # Modulo de biblioteca, sem simbolo inicial.
+            return ""
+        self.__next("START")
+        name = self.__next("ID")[1]
+        logging.log(5, "START: %s", name)
+        add_symbol(name, "FUNC", usage=1)
+        return name
+
+    def __init_directive(self):
+        """init : INIT NUMBER NUMBER NUMBER NUMBER | empty"""
+        if self.token[0] != "INIT":
+            return
+        self.__next("INIT")
+        numbers = [self.__next("NUMBER") for _ in range(4)]
+        logging.log(5, "INIT parsed.")
+        for _, value, _ in numbers:
+            if not isinstance(value, int):
+                raise Exception("INIT: InvalidType: Required INT got FLOAT.")
+        x, y, w, h = [value for _, value, _ in numbers]
+        add_symbol(
+            "__turtle",
+            "OBJECT",
+            lineno=numbers[2][2],
+            value=ParserObject(x=x, y=y, draw=True),
+        )
+        add_symbol(
+            "__window",
+            "OBJECT",
+            lineno=numbers[0][2],
+            value=ParserObject(w=w, h=h),
+        )
+
+    def __imports(self):
+        """imports : imports import | empty"""
+        while self.token[0] == "IMPORT":
+            lineno = self.__next("IMPORT")[2]
+            module = self.__next("STRING")[1]
+            logging.log(5, "IMPORT: %s", module)
+            add_import(module, lineno)
+
+    def __data(self):
+        """data : DATA var_decl data_list | empty"""
+        if self.token[0] != "DATA":
+            return
+        self.__next("DATA")
+        self.__var_decl()
+        while self.token[0] == "ID":
+            self.__var_decl()
+
+    def __var_decl(self):
+        """var_decl : ID value"""
+        _, name, lineno = self.__next("ID")
+        value = self.__next("STRING", "NUMBER")[1]
+        logging.log(5, "VAR: %s", name)
+        add_symbol(
+            name,
+            "VAR",
+            lineno=lineno,
+            value=value,
+            var_type=type(value).__name__,
+        )
+
+    def __code(self):
+        """code : CODE procedures"""
+        self.__next("CODE")
+        while self.token[0] == "DEF":
+            self.__procedure()
+        if self.token[0] != END:
+            raise InvalidToken(self.token)
+
+    def __procedure(self):
+        """procedure : DEF ID COLON statements"""
+        self.__next("DEF")
+        _, name, lineno = self.__next("ID")
+        self.__next("COLON")
+        code = []
+        lines = []
+        tokens = self.__tokens
+        statements = self.__statements
+        token = self.token
+        action = statements.get(token[0])
+        if action is None:
+            raise InvalidToken(token)
+        while action is not None:
+            self.token = next(tokens)
+            code.append(action(token))
+            lines.append(token[2])
+            token = self.token
+            action = statements.get(token[0])
+        if token[0] not in ("DEF", END):
+            raise InvalidToken(token)
+        define_procedure(name, lineno, code, lines)
+
+    # Acoes das instrucoes: recebem o token da instrucao, consomem os
+    # operandos e retornam o texto da instrucao.
+
+    def __single(self, token):
+        """Instrucao sem operandos."""
+        return token[1]
+
+    def __variable(self, token):
+        """var_op : LOAD ID | STOR ID"""
+        _, name, lineno = self.__next("ID")
+        if get_symbol(name) is None:
+            raise Exception(f"Undefined symbol:{lineno}:'{name}' ")
+        return f"{token[1]} {name}"
+
+    def __push(self, token):
+        """push_op : PUSH value | PUSH ID"""
+        kind, value, lineno = self.__next("STRING", "NUMBER", "ID")
+        if kind == "ID":
+            logging.warning(
+                "Expected value instead of ID: %d. Did you mean 'LOAD'?",
+                lineno,
+            )
+            return f"{token[1]} $ERR"
+        return f"{token[1]} {value}"
+
+    def __call(self, token):
+        """call_op : CALL ID"""
+        _, name, lineno = self.__next("ID")
+        call(name, lineno)
+        return f"{token[1]} {name}"
+
+    def __compare(self, token):
+        """compare : CMP value | CMP ID"""
+        kind, value, lineno = self.__next("STRING", "NUMBER", "ID")
+        if kind == "ID" and get_symbol(value) is None:
+            raise Exception(f"Undefined symbol:{lineno}:{value}")
+        return f"{token[1]} {value}"
+
+    def __jump(self, token):
+        """jump : JP jmp_target | JZ jmp_target | ..."""
+        kind, target, lineno = self.__next("LABEL", "NUMBER")
+        if kind == "LABEL":
+            jump(target, lineno)
+        elif not isinstance(target, int):
+            raise Exception("Can't use 'float' with 'jump'.")
+        return " ".join([token[1], target])
+
+    def __label(self, token):
+        """label : LABEL"""
+        _, name, lineno = token
+        define_label(name, lineno)
+        return f"LABEL {name}"
+
+    def __flag(self, token):
+        """flag_ops : SET NUMBER | UNSET NUMBER"""
+        value = self.__next("NUMBER")[1]
+        logging.log(5, "FLAG: %s: %s", token[1], value)
+        if not isinstance(value, int):
+            raise TypeError(f"Expected an integer value: {value}")
+        return f"{token[1]} {value}"
+
+    def __draw(self, token):
+        """draw_ops : MVTO | SETPX"""
+        logging.log(5, "DRAW_CMD: %s", token[1])
+        return token[1]
+
+
+def parse_source(source):
+    """Montar o programa lido de `source`, sem verificar as referencias."""
+    return LineParser(source).program()
+
+
+def parse_program(filename):
+    """Montar o programa LogoASM com o parser escrito a mao."""
+    with open(filename, "rt") as source:
+        start_symbol = parse_source(source)
+    if start_symbol is not None:
+        link_modules(filename, start_symbol, parse_source)
+    check_references()
+    return start_symbol
@@ -0,0 +1,256 @@
+"""Ligacao de programas LogoASM com modulos importados.
+
+Um programa importa modulos com a diretiva `.IMPORT "arquivo"`, depois de
+`.START` e `.INIT`. Um modulo e um arquivo LogoASM (sem `.START`) com
+variaveis e procedimentos, ou um arquivo objeto `.lbo`. Os caminhos sao
+relativos ao diretorio de quem importa, ou a um dos diretorios de
+LOGOVM_PATH.
+
+Cada modulo e montado sozinho, em uma tabela de simbolos propria, e
+salvo no cache (um arquivo `.lbo` cujo nome e o hash do texto do modulo),
+de modo que so e montado de novo quando muda. Defina
+LOGOVM_MODULE_CACHE=0 para desativar o cache.
+
+A ligacao junta as tabelas dos modulos a do programa: chamadas a
+procedimentos de outros modulos sao resolvidas e as contagens de uso
+somadas; variaveis e procedimentos definidos duas vezes sao erros; as
+etiquetas de cada modulo recebem o prefixo `modulo$`, e nao conflitam
+com as de outros modulos. Por fim, os procedimentos dos modulos que nao
+sao alcancaveis a partir do programa sao removidos. O programa ligado
+nao tem mais `.IMPORT`; um modulo ligado (por exemplo, com `--object`)
+mantem todos os procedimentos.
+"""
+
+import hashlib
+import logging
+import os
+
+from logoasm import plycache
+from logoasm.objfile import VERSION, load_object, write_object
+from logoasm.symtable import (
+    SymbolTable,
+    add_symbol,
+    get_symbol,
+    get_symbol_table,
+    iter_symbols,
+    remove_symbol,
+    set_symbol,
+    set_symbol_table,
+)
+
+IMPORTS = "__imports"
+JUMPS = ("JP", "JZ", "JNZ", "JMORE", "JLESS")
+# Atributos que dependem da tabela ou da carga do programa.
+LOCAL_ATTRIBUTES = ("name", "type", "slot", "ops", "pc")
+
+
+class LinkError(Exception):
+    """Erro gerado ao ligar os modulos de um programa."""
+
+    def __init__(self, msg):
+        """Erro de inicializacao com mensagem adequada."""
+        super().__init__(f"Link error: {msg}")
+
+
+def add_import(module, lineno):
+    """Registrar a importacao de `module` (diretiva .IMPORT)."""
+    imports = get_symbol(IMPORTS)
+    if imports is None:
+        add_symbol(IMPORTS, "OBJECT", lineno=lineno, value=[module])
+    else:
+        imports["value"].append(module)
+
+
+def cache_enabled():
+    """Verificar se o cache de modulos esta ativo."""
+    return os.environ.get("LOGOVM_MODULE_CACHE", "1") != "0"
+
+
+def find_module(module, directory):
+    """Obter o caminho do modulo importado por um arquivo de `directory`."""
+    path = os.environ.get("LOGOVM_PATH", "")
+    for base in [directory, *filter(None, path.split(os.pathsep))]:
+        filename = os.path.join(base, module)
+        if os.path.isfile(filename):
+            return os.path.realpath(filename)
+    raise LinkError(f"Module not found: '{module}'")
+
+
+def assemble_module(filename, assemble):
+    """Montar o modulo na tabela de simbolos ativa, usando o cache."""
+    if filename.endswith(".lbo"):
+        load_object(filename)
+        return
+    with open(filename, "rb") as source:
+        digest = hashlib.sha256(source.read())
+    digest.update(f"lbo:{VERSION}".encode())
+    cached = os.path.join(
+        plycache.cache_dir(), "modules", f"{digest.hexdigest()[:24]}.lbo"
+    )
+    if cache_enabled() and os.path.exists(cached):
+        logging.debug("Module '%s' loaded from '%s'.", filename, cached)
+        load_object(cached)
+        return
+    with open(filename, "rt") as source:
+        start = assemble(source)
+    if start is None:
+        raise LinkError(f"Invalid module: '{filename}'")
+    if cache_enabled():
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        partial = f"{cached}.{os.getpid()}"
+        write_object(partial, start)
+        os.replace(partial, cached)
+
+
+def qualify(code, labels, prefix):
+    """Trocar as etiquetas do modulo em `code` pelos nomes qualificados."""
+    qualified = []
+    for text in code:
+        opcode, _, operand = text.partition(" ")
+        if operand in labels and (
+            opcode == "LABEL" or opcode.upper() in JUMPS
+        ):
+            text = f"{opcode} {prefix}{operand}"
+        qualified.append(text)
+    return qualified
+
+
+def merge_module(module, filename, origins):
+    """Juntar a tabela de simbolos `module` a tabela ativa."""
+    prefix = f"{os.path.splitext(os.path.basename(filename))[0]}$"
+    labels = {
+        name
+        for name, symbol in module.iter_symbols()
+        if symbol["type"] == "LABEL"
+    }
+    for name, symbol in module.iter_symbols():
+        symtype = symbol["type"]
+        attributes = {
+            key: value
+            for key, value in symbol.items()
+            if key not in LOCAL_ATTRIBUTES
+        }
+        if attributes.get("code") is not None:
+            attributes["code"] = qualify(attributes["code"], labels, prefix)
+        if symtype == "OBJECT":
+            continue
+        existing = get_symbol(name)
+        if symtype == "LABEL":
+            if get_symbol(f"{prefix}{name}") is not None:
+                raise LinkError(f"Duplicate module name: '{filename}'")
+            add_symbol(f"{prefix}{name}", "LABEL", **attributes)
+        elif symtype == "INT" or (
+            symtype == "FUNC" and attributes.get("code") is None
+        ):
+            # Funcao da ROM ou procedimento de outro modulo.
+            if existing is None:
+                add_symbol(name, symtype, **attributes)
+            elif existing["type"] not in ("FUNC", "INT"):
+                raise LinkError(f"Not a procedure: '{name}' in '{filename}'")
+            else:
+                usage = existing.get("usage", 0) + attributes.get("usage", 0)
+                set_symbol(name, usage=usage)
+        elif existing is None:
+            add_symbol(name, symtype, **attributes)
+            origins[name] = filename
+        elif (
+            symtype == "FUNC"
+            and existing["type"] == "FUNC"
+            and existing.get("code") is None
+        ):
+            attributes["usage"] = existing.get("usage", 0) + attributes.get(
+                "usage", 0
+            )
+            set_symbol(name, **attributes)
+            origins[name] = filename
+        else:
+            where = origins.get(name, "the program")
+            raise LinkError(
+                f"Duplicate symbol '{name}': '{where}' and '{filename}'"
+            )
+
+
+def link_imports(imports, directory, assemble, origins, linked):
+    """Montar e juntar os modulos importados, e os que eles importam."""
+    for module in imports:
+        filename = find_module(module, directory)
+        if filename in linked:
+            continue
+        linked.add(filename)
+        table = SymbolTable(get_symbol_table().case_insensitive)
+        program = get_symbol_table()
+        set_symbol_table(table)
+        try:
+            assemble_module(filename, assemble)
+        finally:
+            set_symbol_table(program)
+        nested = table.get_symbol(IMPORTS)
+        if nested is not None:
+            link_imports(
+                nested["value"],
+                os.path.dirname(filename),
+                assemble,
+                origins,
+                linked,
+            )
+        merge_module(table, filename, origins)
+        logging.info("Module linked: %s", filename)
+
+
+def strip_unused(start, origins):
+    """Remover os procedimentos dos modulos que nunca sao chamados."""
+    procedures = {
+        name: symbol.get("code") or []
+        for name, symbol in iter_symbols()
+        if symbol["type"] == "FUNC"
+    }
+    pending = [name for name in procedures if name not in origins]
+    pending.append(start)
+    reachable = set(pending)
+    while pending:
+        for text in procedures.get(pending.pop(), ()):
+            opcode, _, operand = text.partition(" ")
+            if opcode.upper() == "CALL" and operand not in reachable:
+                reachable.add(operand)
+                pending.append(operand)
+    removed = 0
+    for name, code in procedures.items():
+        if name in reachable:
+            continue
+        for text in code:
+            opcode, _, operand = text.partition(" ")
+            if opcode == "LABEL":
+                remove_symbol(operand)
+        remove_symbol(name)
+        removed += 1
+    return removed
+
+
+def link_modules(filename, start, assemble, linked=None):
+    """Ligar ao programa montado de `filename` os modulos que ele importa.
+
+    `assemble(source)` monta o texto de um modulo na tabela de simbolos
+    ativa e retorna o simbolo inicial, ou None se houver erros. Os
+    caminhos dos modulos encontrados sao acrescentados a `linked`, se
+    dado, mesmo que a ligacao falhe.
+    """
+    imports = get_symbol(IMPORTS)
+    if imports is None:
+        return
+    if linked is None:
+        linked = set()
+    linked.add(os.path.realpath(filename))
+    origins = {}
+    link_imports(
+        imports["value"],
+        os.path.dirname(os.path.abspath(filename)),
+        assemble,
+        origins,
+        linked,
+    )
+    # O programa ligado, e um arquivo objeto gerado dele, nao importa mais.
+    remove_symbol(IMPORTS)
+    # Um modulo ligado (sem .START) mantem todos os procedimentos.
+    if start:
+        removed = strip_unused(start, origins)
+        logging.info("Linker: %d unused procedures removed.", removed)
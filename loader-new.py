@@ -1,13 +1,73 @@
-"""Carregador para programas LogoVM."""
-
-def loader():
-    """Ajustar endereços ao programa de rum."""
-    for symbol, data in get_symbols_by_class("FUNC").items():
-        code = data.get("code")
-        if code is None:
-            logging.error("Undefined function: %s", symbol)
-            raise UndefinedReference("FUNCTION", symbol)
-        for addr, cmd in enumerate(code):
-            if cmd.startswith("LABEL"):
-                _, name = cmd.split(" ", 2)
-                set_symbol(name, pc=addr)
\ No newline at end of file
+"""Carregador para programas LogoVM."""
+
+import logging
+
+from logovm import rom
+from logovm.errors import UndefinedReference
+from logovm.logovm import call, compare_variable, tail_call, unbound
+
+JUMPS = ("JP", "JZ", "JNZ", "JMORE", "JLESS")
+
+
+def loader(vm):
+    """Ajustar endereços e pre-decodificar as instrucoes do programa."""
+    symtable = vm.symtable
+    for symbol, data in symtable.get_symbols_by_class("FUNC").items():
+        code = data.get("code")
+        if code is None:
+            logging.error("Undefined function: %s", symbol)
+            raise UndefinedReference("FUNCTION", symbol)
+        for addr, cmd in enumerate(code):
+            if cmd.startswith("LABEL"):
+                _, name = cmd.split(" ", 2)
+                symtable.set_symbol(name, pc=addr)
+        symtable.set_symbol(symbol, ops=[vm.decode(cmd) for cmd in code])
+
+
+def __resolve(vm, name, symtype, attr=None):
+    """Obter o simbolo ligado a um operando, ou falhar antes da execucao."""
+    symbol = vm.symtable.get_symbol(name)
+    if symbol is None or symbol["type"] != symtype:
+        logging.error("Undefined %s: %s", symtype, name)
+        raise UndefinedReference(symtype, name)
+    if attr is not None:
+        if symbol.get(attr) is None:
+            logging.error("Undefined %s: %s", symtype, name)
+            raise UndefinedReference(symtype, name)
+        return symbol[attr]
+    return symbol
+
+
+def __link(vm, instruction):
+    """Ligar os operandos de uma instrucao aos seus alvos finais."""
+    opcode, _, args = instruction
+    if opcode in JUMPS and isinstance(args[0], str):
+        target = __resolve(vm, args[0], "LABEL", "pc")
+        return instruction._replace(args=(target,))
+    if opcode in ("LOAD", "STOR"):
+        slot = __resolve(vm, args[0], "VAR", "slot")
+        return instruction._replace(args=(slot,))
+    if opcode == "CMP" and isinstance(args[0], str):
+        slot = __resolve(vm, args[0], "VAR", "slot")
+        return instruction._replace(
+            handler=vm.bind(compare_variable), args=(slot,)
+        )
+    if opcode == "CALL":
+        function = vm.symtable.get_symbol(args[0])
+        if function is not None and function["type"] == "INT":
+            return instruction._replace(
+                handler=vm.bind(rom.internal[function["name"]]), args=()
+            )
+        return instruction._replace(args=(__resolve(vm, args[0], "FUNC"),))
+    return instruction
+
+
+def link(vm):
+    """Resolver etiquetas, variaveis e chamadas de todos os procedimentos."""
+    symtable = vm.symtable
+    for symbol, data in symtable.get_symbols_by_class("FUNC").items():
+        ops = [__link(vm, op) for op in data["ops"]]
+        for pc, (opcode, handler, _) in enumerate(ops[:-1]):
+            if unbound(handler) is call and ops[pc + 1].opcode == "RET":
+                ops[pc] = ops[pc]._replace(handler=vm.bind(tail_call))
+        symtable.set_symbol(symbol, ops=ops)
@@ -1,296 +1,348 @@
-"""Executar o programa LogoVM."""
-
-import logging
-import operator
-import random
-from math import trunc
-
-from logoasm.parser import get_symbol, set_symbol
-
-from logovm import rom
-from logovm.machinery import (
-    reg,
-    pc_stack,
-    flags,
-    Flags,
-    stack_pop,
-    stack_push,
-    stack_peek,
-    set_flag,
-    unset_flag,
-    set_pos,
-    set_pixel,
-    halt,
-)
-
-from logovm.errors import InvalidAddress, TypeMismatch
-
-
-def idiv():
-    """Executar instrucao: IDIV."""
-    reg[3] = stack_pop()
-    reg[4] = stack_pop()
-    reg[0] = operator.floordiv(reg[0], reg[2])
-    reg[2] = operator.mod(reg[0], reg[2])
-    stack_push(reg[2])
-    stack_push(reg[0])
-
-
-def compare(value):
-    """Executar instrucao: CMP."""
-    lhs = stack_peek()
-    logging.debug("VALUE: %s", value)
-    try:
-        rhs = float(value)
-    except ValueError:
-        rhs = get_symbol(value)["value"]
-    if not (
-        isinstance(lhs, (int, float))
-        and isinstance(rhs, (int, float))
-        or (isinstance(lhs, str) and isinstance(rhs, str))
-    ):
-        raise TypeMismatch("CMP", rhs, lhs)
-    if lhs < rhs:
-        reg[0] = -2
-    elif lhs > rhs:
-        reg[0] = +2
-    else:
-        reg[0] = 0
-
-
-def jump(target):
-    """Executar pular as instrucoes: JP, JZ, JNZ, JMORE, JLESS."""
-    reg[6] = int(get_symbol(target)["pc"])
-    if reg[6] < 0:
-        set_flag(Flags.EXC)
-        raise InvalidAddress(reg[6])
-    pc_stack[-2] = int(reg[6])
-
-
-def skip_next(value):
-    def wrap_jump():
-        logging.debug("Skip next if %szero: R0 = %s", "" if value else "not ", reg[0])
-        if (reg[0] == 0) is value:
-            pc_stack[-2] += 2
-
-    return wrap_jump
-
-
-def jump_relative(value):
-    """Executar instrucao: JR."""
-    logging.debug("JUMP: %s", value)
-    try:
-        reg[6] = int(value)
-    except ValueError:
-        reg[6] = int(get_symbol(value)["pc"])
-    if reg[6] < 0:
-        set_flag(Flags.EXC)
-        raise InvalidAddress(reg[8])
-    pc_stack[-2] += reg[8]
-
-
-def jump_if(oper):
-    """Implementar pular operacoes que comparam o R0."""
-    logging.debug("Conditional JUMP: %s", open)
-    opers = {
-        "==": operator.eq,
-        "!=": operator.ne,
-        "<": operator.lt,
-        ">": operator.gt,
-    }
-
-    def wrap_jmp(cmp):
-        def do_jump(target):
-            logging.debug("JUMP: R0 = %s | TST = %s", reg[0], cmp(reg[0], 0))
-            if cmp(reg[0], 0):
-                jump(target)
-
-        return do_jump
-
-    return wrap_jmp(opers[oper])
-
-
-def ret():
-    """Implementar o comando RET."""
-    pc_stack.pop()
-    logging.debug("RET: %s", pc_stack)
-
-
-def label(lbl):
-    """Implementar suporte de etiqueta."""
-    logging.debug("LABEL: %s", lbl)
-    set_symbol(lbl, pc=pc_stack[-2])
-
-
-def binop(oper):
-    """Implementar operadores binários aritméticos."""
-    logging.debug("BINOP: %s", oper)
-
-    def binary_op(operation):
-        def exec_op():
-            reg[2] = stack_pop()
-            reg[0] = stack_pop()
-            reg[0] = operation(reg[0], reg[2])
-            stack_push(reg[0])
-
-        return exec_op
-
-    opers = {
-        "+": operator.add,
-        "-": operator.sub,
-        "*": operator.mul,
-        "/": operator.truediv,
-        "**": operator.pow,
-        "&": operator.and_,
-        "|": operator.or_,
-        "^": operator.xor,
-        ">>": operator.rshift,
-        "<<": operator.lshift,
-    }
-    return binary_op(opers[oper])
-
-
-def invert_bits():
-    """Execute a operação inversa dos bits."""
-    logging.debug("Invert bits.")
-    reg[0] = ~stack_pop()
-    stack_push(reg[0])
-
-
-def push_flags():
-    """Implemente o comando PUSHF."""
-    logging.debug("Push flags.")
-    stack_push(flags)
-
-
-def push(value):
-    logging.debug("PUSH: %s", value)
-    if isinstance(value, str):
-        try:
-            try:
-                value = int(value)
-            except ValueError:
-                value = float(value)
-        except ValueError:
-            pass
-    stack_push(value)
-
-
-def pop():
-    """Implementar o comando POP."""
-    logging.debug("POP")
-    reg[0] = stack_pop()
-
-
-def dup():
-    """Implementar o comando DUP."""
-    logging.debug("DUP")
-    pop()
-    stack_push(reg[0])
-    stack_push(reg[0])
-
-
-def load(var):
-    """Implementar o comando LOAD."""
-    logging.debug("LOAD: %s STACK: %s", var, stack_peek())
-    variable = get_symbol(var)
-    reg[0] = variable["value"]
-    stack_push(reg[0])
-
-
-def store(var):
-    """Implementar o comando STORE."""
-    logging.debug("STORE: %s STACK: %s", var, stack_peek())
-    variable = get_symbol(var)
-    reg[0] = stack_pop()
-    variable["value"] = reg[0]
-
-
-def rand():
-    """Implementar comando RAND."""
-    reg[0] = random.random()
-    logging.debug("RANDOM: %s", reg[0])
-    push(reg[0])
-
-
-def truncate():
-    """Implementar  comando TRUNC."""
-    reg[0] = trunc(stack_pop())
-    logging.debug("TRUNC: %s", reg[0])
-    push(reg[0])
-
-
-def call(function_id):
-    """Implementar o comando CALL."""
-    logging.debug("CALL: %s", function_id)
-    fn = get_symbol(function_id)
-    if fn["type"] == "INT":
-        rom.internal[fn["name"]]()
-    elif fn["type"] == "FUNC":
-        pc_stack.append(-2)
-        call_stack_sz = len(pc_stack)
-        while call_stack_sz == len(pc_stack):
-            pc_stack[-2] += 2
-            logging.debug("PC: %s", repr(pc_stack))
-            pc = pc_stack[-2]
-            if not 0 <= pc < len(fn["code"]):
-                logging.critical("Invalid PC: %s: %s", function_id, pc)
-                raise InvalidAddress(pc)
-            execute_command(fn["code"][pc])
-    else:
-        raise Exception(
-            f"Invalid symbol type: expected FUNC/INT, got {fn['type']}"
-        )
-
-
-def execute_command(cmd):
-    """Executar o comando LogoASM."""
-    logging.debug("EXEC: %s", cmd)
-    cmd, *param = cmd.split(" ", 2)
-    cmd = "LABEL" if cmd == ":" else cmd
-    to_call = cmds[cmd]
-    if param:
-        to_call(param[0])
-    else:
-        to_call()
-
-
-cmds = {
-    "PUSH": push,
-    "PUSHF": push_flags,
-    "POP": pop,
-    "DUP": dup,
-    "LOAD": load,
-    "STOR": store,
-    "CALL": call,
-    "CMP": compare,
-    "JR": jump_relative,
-    "SKIPZ": skip_next(True),
-    "SKIPNZ": skip_next(False),
-    "JP": jump,
-    "JZ": jump_if("=="),
-    "JNZ": jump_if("!="),
-    "JMORE": jump_if(">"),
-    "JLESS": jump_if("<"),
-    "RET": ret,
-    "HALT": halt,
-    "LABEL": label,
-    "ADD": binop("+"),
-    "SUB": binop("-"),
-    "MUL": binop("*"),
-    "DIV": binop("/"),
-    "IDIV": idiv,
-    "POW": binop("**"),
-    "TRUNC": truncate,
-    "AND": binop("&"),
-    "OR": binop("|"),
-    "XOR": binop("^"),
-    "NOT": invert_bits,
-    "SHFTR": binop(">>"),
-    "SHFTL": binop("<<"),
-    "RAND": rand,
-    "SET": set_flag,
-    "UNSET": unset_flag,
-    "MVTO": set_pos,
-    "SETPX": set_pixel,
-}
\ No newline at end of file
+"""Executar o programa LogoVM."""
+
+import logging
+import operator
+import random
+from collections import namedtuple
+from math import trunc
+
+from types import MethodType
+
+from logoasm.symtable import SymbolTable, set_symbol_table
+
+from logovm import rom
+from logovm.machinery import Flags, Machine
+
+from logovm.errors import InvalidAddress, TypeMismatch
+
+
+Instruction = namedtuple("Instruction", "opcode handler args")
+Instruction.__doc__ = """Instrucao pre-decodificada, com operandos ja tipados."""
+
+
+def idiv(vm):
+    """Executar instrucao: IDIV."""
+    reg = vm.reg
+    reg[3] = vm.stack_pop()
+    reg[4] = vm.stack_pop()
+    reg[0] = operator.floordiv(reg[0], reg[2])
+    reg[2] = operator.mod(reg[0], reg[2])
+    vm.stack_push(reg[2])
+    vm.stack_push(reg[0])
+
+
+def compare(vm, rhs):
+    """Executar instrucao: CMP."""
+    reg = vm.reg
+    lhs = vm.stack_peek()
+    if not (
+        isinstance(lhs, (int, float))
+        and isinstance(rhs, (int, float))
+        or (isinstance(lhs, str) and isinstance(rhs, str))
+    ):
+        raise TypeMismatch("CMP", rhs, lhs)
+    if lhs < rhs:
+        reg[0] = -2
+    elif lhs > rhs:
+        reg[0] = +2
+    else:
+        reg[0] = 0
+
+
+def compare_variable(vm, slot):
+    """Executar instrucao: CMP, contra uma variavel ligada."""
+    compare(vm, vm.memory[slot])
+
+
+def jump(vm, target):
+    """Executar pular as instrucoes: JP, JZ, JNZ, JMORE, JLESS."""
+    reg = vm.reg
+    reg[6] = target
+    if reg[6] < 0:
+        vm.set_flag(Flags.EXC)
+        raise InvalidAddress(reg[6])
+    vm.pc_stack[-1] = reg[6]
+
+
+def skip_next(value):
+    def wrap_jump(vm):
+        if (vm.reg[0] == 0) is value:
+            vm.pc_stack[-1] += 1
+
+    return wrap_jump
+
+
+def jump_relative(vm, value):
+    """Executar instrucao: JR."""
+    vm.reg[6] = int(value)
+    vm.pc_stack[-1] += vm.reg[6]
+
+
+def jump_if(oper):
+    """Implementar pular operacoes que comparam o R0."""
+    opers = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        "<": operator.lt,
+        ">": operator.gt,
+    }
+
+    def wrap_jmp(cmp):
+        def do_jump(vm, target):
+            if cmp(vm.reg[0], 0):
+                jump(vm, target)
+
+        return do_jump
+
+    return wrap_jmp(opers[oper])
+
+
+def ret(vm):
+    """Implementar o comando RET."""
+    vm.pc_stack.pop()
+    vm.call_stack.pop()
+    return True
+
+
+def halt_machine(vm):
+    """Implementar o comando HALT."""
+    vm.halt()
+    return True
+
+
+def label(vm, lbl):
+    """Implementar suporte de etiqueta (enderecos resolvidos na ligacao)."""
+
+
+def binop(oper):
+    """Implementar operadores binários aritméticos."""
+
+    def binary_op(operation):
+        def exec_op(vm):
+            reg, stack_pop = vm.reg, vm.stack_pop
+            reg[2] = stack_pop()
+            reg[0] = stack_pop()
+            reg[0] = operation(reg[0], reg[2])
+            vm.stack_push(reg[0])
+
+        return exec_op
+
+    opers = {
+        "+": operator.add,
+        "-": operator.sub,
+        "*": operator.mul,
+        "/": operator.truediv,
+        "**": operator.pow,
+        "&": operator.and_,
+        "|": operator.or_,
+        "^": operator.xor,
+        ">>": operator.rshift,
+        "<<": operator.lshift,
+    }
+    return binary_op(opers[oper])
+
+
+def invert_bits(vm):
+    """Execute a operação inversa dos bits."""
+    vm.reg[0] = ~vm.stack_pop()
+    vm.stack_push(vm.reg[0])
+
+
+def push_flags(vm):
+    """Implemente o comando PUSHF."""
+    vm.stack_push(vm.flags)
+
+
+def parse_value(value):
+    """Converter um operando textual para int, float ou str."""
+    try:
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    except ValueError:
+        return value
+
+
+def push(vm, value):
+    """Implementar o comando PUSH."""
+    vm.stack_push(value)
+
+
+def pop(vm):
+    """Implementar o comando POP."""
+    vm.reg[0] = vm.stack_pop()
+
+
+def dup(vm):
+    """Implementar o comando DUP."""
+    pop(vm)
+    vm.stack_push(vm.reg[0])
+    vm.stack_push(vm.reg[0])
+
+
+def load(vm, slot):
+    """Implementar o comando LOAD."""
+    value = vm.reg[0] = vm.memory[slot]
+    vm.stack_push(value)
+
+
+def store(vm, slot):
+    """Implementar o comando STORE."""
+    vm.memory[slot] = vm.reg[0] = vm.stack_pop()
+
+
+def rand(vm):
+    """Implementar comando RAND."""
+    vm.reg[0] = random.random()
+    push(vm, vm.reg[0])
+
+
+def truncate(vm):
+    """Implementar  comando TRUNC."""
+    vm.reg[0] = trunc(vm.stack_pop())
+    push(vm, vm.reg[0])
+
+
+def call(vm, fn):
+    """Implementar o comando CALL.
+
+    Um procedimento FUNC ganha um novo quadro em `pc_stack`/`call_stack`;
+    o retorno verdadeiro avisa o laco de `execute` da troca de quadro.
+    """
+    if fn["type"] == "INT":
+        rom.internal[fn["name"]](vm)
+    elif fn["type"] == "FUNC":
+        vm.pc_stack.append(-1)
+        vm.call_stack.append(fn)
+        return True
+    else:
+        raise Exception(
+            f"Invalid symbol type: expected FUNC/INT, got {fn['type']}"
+        )
+    return False
+
+
+def tail_call(vm, fn):
+    """Implementar CALL seguido de RET, reaproveitando o quadro atual."""
+    vm.pc_stack[-1] = -1
+    vm.call_stack[-1] = fn
+    return True
+
+
+def unbound(handler):
+    """Obter a funcao de um handler ligado a uma LogoVM."""
+    return getattr(handler, "__func__", handler)
+
+
+class LogoVM(Machine):
+    """Uma LogoVM completa: maquina, tabela de simbolos e memoria.
+
+    Os handlers das instrucoes sao funcoes do modulo que recebem a VM
+    como primeiro argumento, e sao ligados a ela por `decode`.
+    """
+
+    def __init__(self, symtable=None, **kwargs):
+        """Inicializar a VM, com uma tabela de simbolos nova por padrao."""
+        super().__init__(**kwargs)
+        self.symtable = SymbolTable() if symtable is None else symtable
+        self.memory = self.symtable.memory
+        self.instructions = 0
+
+    def activate(self):
+        """Ativar a tabela de simbolos da VM na thread corrente."""
+        set_symbol_table(self.symtable)
+
+    def bind(self, handler):
+        """Ligar um handler (ou rotina ROM) a esta VM."""
+        return MethodType(unbound(handler), self)
+
+    def decode(self, cmd):
+        """Decodificar um comando LogoASM em uma Instruction."""
+        logging.debug("DECODE: %s", cmd)
+        opcode, *param = cmd.split(" ", 1)
+        opcode = "LABEL" if opcode == ":" else opcode
+        handler = self.bind(cmds[opcode])
+        convert = operand_types.get(opcode, str)
+        return Instruction(opcode, handler, tuple(convert(p) for p in param))
+
+    def execute(self, fn):
+        """Executar o procedimento `fn` em um unico laco de despacho."""
+        pc_stack, call_stack = self.pc_stack, self.call_stack
+        depth = len(pc_stack)
+        tracer = self.tracer
+        steps = 0
+        call(self, fn)
+        try:
+            while len(pc_stack) > depth:
+                fn = call_stack[-1]
+                function_id = fn["name"]
+                code = fn["ops"]
+                size = len(code)
+                while True:
+                    pc = pc_stack[-1] + 1
+                    pc_stack[-1] = pc
+                    steps += 1
+                    if not 0 <= pc < size:
+                        logging.critical(
+                            "Invalid PC: %s: %s", function_id, pc
+                        )
+                        raise InvalidAddress(pc)
+                    if tracer is not None:
+                        tracer.instruction(function_id, pc, code[pc])
+                    _, handler, args = code[pc]
+                    if handler(*args):
+                        break
+        finally:
+            self.instructions += steps
+
+
+cmds = {
+    "PUSH": push,
+    "PUSHF": push_flags,
+    "POP": pop,
+    "DUP": dup,
+    "LOAD": load,
+    "STOR": store,
+    "CALL": call,
+    "CMP": compare,
+    "JR": jump_relative,
+    "SKIPZ": skip_next(True),
+    "SKIPNZ": skip_next(False),
+    "JP": jump,
+    "JZ": jump_if("=="),
+    "JNZ": jump_if("!="),
+    "JMORE": jump_if(">"),
+    "JLESS": jump_if("<"),
+    "RET": ret,
+    "HALT": halt_machine,
+    "LABEL": label,
+    "ADD": binop("+"),
+    "SUB": binop("-"),
+    "MUL": binop("*"),
+    "DIV": binop("/"),
+    "IDIV": idiv,
+    "POW": binop("**"),
+    "TRUNC": truncate,
+    "AND": binop("&"),
+    "OR": binop("|"),
+    "XOR": binop("^"),
+    "NOT": invert_bits,
+    "SHFTR": binop(">>"),
+    "SHFTL": binop("<<"),
+    "RAND": rand,
+    "SET": Machine.set_flag,
+    "UNSET": Machine.unset_flag,
+    "MVTO": Machine.set_pos,
+    "SETPX": Machine.set_pixel,
+}
+
+
+# Conversao de operandos feita uma unica vez, na carga do programa.
+operand_types = {
+    "PUSH": parse_value,
+    "CMP": parse_value,
+    "JR": int,
+    "SET": int,
+    "UNSET": int,
+}
@@ -1,136 +1,400 @@
-"""LogoVM program."""
-
-import sys
-import argparse
-import logging
-
-from logovm.logovm import Flags, set_flag, call, stack_push
-
-from logoasm.parser import parse_program
-from logoasm.lexer import IllegalCharacter
-from logoasm.symtable import add_symbol, get_symbol
-
-import logovm.machinery
-from logovm.loader import UndefinedReference, loader
-
-
-def welcome(filename):
-    """Imprimir mensagem de boas-vindas."""
-    logging.info("Welcome to the LogoVM.")
-    logging.info("Loading program: %s", filename)
-
-
-def cli_parser():
-    """Analisar argumentos de linha de comando."""
-    parser = argparse.ArgumentParser(
-        prog="LogoVM",
-        description="LogoVM is a Compiler teaching tool",
-    )
-    group = parser.add_mutually_exclusive_group()
-    group.add_argument(
-        "-n",
-        "--netpbm",
-        action="store_true",
-        help="Forces PGM/PPM image output.",
-    )
-    group.add_argument(
-        "-p", "--png", action="store_true", help="Forces PNG image output."
-    )
-    group.add_argument(
-        "-j", "--jpg", action="store_true", help="Forces JPEG image output."
-    )
-    parser.add_argument(
-        "-d",
-        "--debug",
-        action="count",
-        default=0,
-        help="Turn on logging debug mode. Implies PGM/PPM graphics.",
-    )
-    parser.add_argument("filename", help="LogoASM source file name.")
-    parser.add_argument("args", nargs="*", help="Program parameters.")
-
-    return parser.parse_args()
-
-
-def parse_command_line():
-    options = cli_parser()
-    log_format = "%(levelname)s (%(funcName)s) %(message)s"
-    level = 30 - (10 * (3 if options.debug > 3 else options.debug))
-    logging.basicConfig(force=True, format=log_format, level=level)
-    logging.addLevelName(5, "PARSER")
-    if options.debug or options.netpbm:
-        logovm.machinery.image_format = "pgm"
-    elif options.jpg:
-        logovm.machinery.image_format = "jpg"
-    elif options.png:
-        logovm.machinery.image_format = "png"
-    for value in options.args:
-        try:
-            try:
-                stack_push(int(value))
-            except ValueError:
-                stack_push(float(value))
-        except ValueError:
-            stack_push(value)
-    return options.filename
-
-
-def run_program(start):
-    """Execute o programa definido em symtable, começando do início."""
-    if start is None:
-        return 2
-
-    loader()
-    call(start)
-    return 0
-
-
-def add_internal_functions():
-    """Adicione funções ROM à tabela de símbolos usando a função add_symbol fornecida."""
-    # Funcoes da tartaruga.
-    add_symbol("CLRSCR", "INT", lineno=0)
-    add_symbol("MOVE", "INT", lineno=0)
-
-    add_symbol("READ", "INT", lineno=0)
-    add_symbol("WRITE", "INT", lineno=0)
-
-
-def main():
-    """Ponto de entrada para o LogoVM."""
-    filename = parse_command_line()
-    set_flag(Flags.PEN)
-    add_internal_functions()
-    welcome(filename)
-
-    try:
-        start = parse_program(filename)
-    except IllegalCharacter as illchar:
-        logging.exception(str(illchar))
-    except UndefinedReference as unref:
-        logging.exception(str(unref))
-    else:
-        if start is None:
-            return 2
-        try:
-            args = {}
-            obj = get_symbol("__turtle")
-            if obj:
-                obj = obj["value"]
-                args["x"] = obj.x
-                args["y"] = obj.y
-                obj = get_symbol("__window")
-                if not obj:
-                    raise Exception("InternalError: Window object undefined.")
-                obj = obj["value"]
-                args["width"] = obj.w
-                args["height"] = obj.h
-            logovm.machinery.init(**args)
-
-            return run_program(start)
-        except KeyboardInterrupt:
-            logging.exception("SIGINT: Keyboard interrupt.")
-    return 1
-
-
-if __name__ == "__main__":
+"""LogoVM program."""
+
+import os
+import sys
+import time
+import argparse
+import logging
+
+from logovm.logovm import Flags, LogoVM
+
+from logoasm import parallel
+from logoasm.incremental import IncrementalAssembler
+from logoasm.lexer import IllegalCharacter
+from logoasm.linker import LinkError
+from logoasm.objfile import ObjectFileError, load_object, write_object
+from logoasm.peephole import optimize_program
+from logoasm.symtable import add_symbol
+
+from logovm.compiler import compile_program
+from logovm.frames import FrameRecorder
+from logovm.fusion import fuse, load_sequences
+from logovm.tracer import ProfilingTracer, get_tracer, set_tracer, tracers
+from logovm.loader import UndefinedReference, link, loader
+
+# Intervalo, em segundos, entre as verificacoes do arquivo em '--watch'.
+WATCH_INTERVAL = 0.5
+
+
+def welcome(filename):
+    """Imprimir mensagem de boas-vindas."""
+    logging.info("Welcome to the LogoVM.")
+    logging.info("Loading program: %s", filename)
+
+
+def cli_parser(args=None):
+    """Analisar argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(
+        prog="LogoVM",
+        description="LogoVM is a Compiler teaching tool",
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "-n",
+        "--netpbm",
+        action="store_true",
+        help="Forces PGM/PPM image output.",
+    )
+    group.add_argument(
+        "-p", "--png", action="store_true", help="Forces PNG image output."
+    )
+    group.add_argument(
+        "-j", "--jpg", action="store_true", help="Forces JPEG image output."
+    )
+    parser.add_argument(
+        "-1",
+        "--mono",
+        action="store_true",
+        help="Save 1-bit monochrome images (PBM or 1-bit PNG).",
+    )
+    parser.add_argument(
+        "--image",
+        metavar="NAME",
+        help="Base name of the saved image (default: a timestamp).",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(10),
+        default=6,
+        metavar="0-9",
+        help="PNG compression level (default: 6).",
+    )
+    parser.add_argument(
+        "--frames",
+        metavar="TARGET",
+        help="Save 'CALL FRAME' snapshots as TARGET-NNNN images, "
+        "or as an animated GIF if TARGET ends with '.gif'.",
+    )
+    parser.add_argument(
+        "--frame-delay",
+        type=int,
+        default=100,
+        metavar="MS",
+        help="Delay between GIF frames (default: 100).",
+    )
+    parser.add_argument(
+        "-d",
+        "--debug",
+        action="count",
+        default=0,
+        help="Turn on logging debug mode. Implies PGM/PPM graphics.",
+    )
+    parser.add_argument(
+        "--trace",
+        choices=sorted(tracers),
+        help="Install a VM tracer ('-dd' implies 'log').",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report counts and time per opcode, procedure and source line.",
+    )
+    parser.add_argument(
+        "--profile-stacks",
+        metavar="FILE",
+        help="Write the profile as collapsed stacks, for flame graph tools "
+        "(implies '--profile').",
+    )
+    parser.add_argument(
+        "--lexer",
+        choices=["ply", "fast"],
+        default="ply",
+        help="Tokenizer used by the assembler (default: ply).",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=["ply", "lines"],
+        default="ply",
+        help="Parser used by the assembler: PLY yacc or the hand-written "
+        "line parser, which ignores '--lexer' (default: ply).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Assemble programs with many procedures in N processes "
+        "(default: 1).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Run the program again whenever the source file changes, "
+        "reassembling only the changed procedures.",
+    )
+    parser.add_argument(
+        "-O",
+        "--optimize",
+        action="store_true",
+        help="Run the peephole optimizer over the assembled code.",
+    )
+    parser.add_argument(
+        "--no-fusion",
+        action="store_true",
+        help="Do not install superinstructions.",
+    )
+    parser.add_argument(
+        "--fusions",
+        metavar="FILE",
+        help="Also fuse the opcode sequences listed in FILE "
+        "(see 'logovm.ngrams').",
+    )
+    parser.add_argument(
+        "--compile",
+        choices=["py"],
+        help="Compile the program ahead of time to the given backend.",
+    )
+    parser.add_argument(
+        "--compile-cache",
+        action="store_true",
+        help="Keep the compiled program in '<filename>.lvm.py'.",
+    )
+    parser.add_argument(
+        "-o",
+        "--object",
+        metavar="FILE",
+        help="Assemble the program to a '.lbo' object file and exit.",
+    )
+    parser.add_argument(
+        "filename", help="LogoASM source or '.lbo' object file name."
+    )
+    parser.add_argument("args", nargs="*", help="Program parameters.")
+
+    return parser.parse_args(args)
+
+
+def parse_command_line(args=None):
+    options = cli_parser(args)
+    log_format = "%(levelname)s (%(funcName)s) %(message)s"
+    level = 30 - (10 * (3 if options.debug > 3 else options.debug))
+    logging.basicConfig(force=True, format=log_format, level=level)
+    logging.addLevelName(5, "PARSER")
+    if options.profile_stacks:
+        options.profile = True
+    if options.profile and (options.trace or options.compile):
+        logging.warning("--profile disables --trace and --compile.")
+        options.trace = options.compile = None
+    if options.trace is None and options.debug > 1 and not options.profile:
+        options.trace = "log"
+    return options
+
+
+def create_vm(options):
+    """Criar uma LogoVM configurada pelas opções de linha de comando."""
+    vm = LogoVM()
+    if options.debug or options.netpbm:
+        vm.image_format = "pgm"
+    elif options.jpg:
+        vm.image_format = "jpg"
+    elif options.png:
+        vm.image_format = "png"
+    vm.image_mono = options.mono
+    vm.png_compress_level = options.compress_level
+    vm.image_name = options.image
+    if options.profile:
+        set_tracer(vm, ProfilingTracer(vm))
+    elif options.trace:
+        set_tracer(vm, tracers[options.trace](vm))
+    for value in options.args:
+        try:
+            try:
+                vm.stack_push(int(value))
+            except ValueError:
+                vm.stack_push(float(value))
+        except ValueError:
+            vm.stack_push(value)
+    vm.set_flag(Flags.PEN)
+    return vm
+
+
+def assemble(filename, options):
+    """Montar o programa com o parser escolhido na linha de comando."""
+    return parallel.parse_program(
+        filename, options.lexer, options.parser, options.jobs
+    )
+
+
+def link_program(vm, options):
+    """Carregar, ligar e fundir as instrucoes do programa da symtable."""
+    try:
+        loader(vm)
+        link(vm)
+    except UndefinedReference as unref:
+        logging.error(str(unref))
+        return False
+    # Com um rastreador instalado, cada instrucao deve gerar seu evento.
+    if not (options.compile or options.no_fusion or vm.tracer):
+        sequences = load_sequences(options.fusions) if options.fusions else ()
+        logging.debug("Superinstructions: %d", fuse(vm, sequences))
+    return True
+
+
+def run_program(vm, start, options):
+    """Execute o programa definido em symtable, começando do início."""
+    if start is None:
+        return 2
+
+    if not link_program(vm, options):
+        return 1
+    if options.frames:
+        vm.recorder = FrameRecorder(
+            options.frames,
+            *vm.video_mode(),
+            image_format=vm.image_format,
+            delay=options.frame_delay,
+        )
+    try:
+        if options.compile == "py":
+            compile_program(
+                vm, start, options.filename, cache=options.compile_cache
+            )()
+        else:
+            vm.execute(vm.symtable.get_symbol(start))
+    finally:
+        if vm.recorder is not None:
+            vm.recorder.close()
+    if hasattr(get_tracer(vm), "report"):
+        get_tracer(vm).report()
+    if options.profile_stacks:
+        get_tracer(vm).write_collapsed(options.profile_stacks)
+    return 0
+
+
+def add_internal_functions():
+    """Adicione funções ROM à tabela de símbolos usando a função add_symbol fornecida."""
+    # Funcoes da tartaruga.
+    add_symbol("CLRSCR", "INT", lineno=0)
+    add_symbol("MOVE", "INT", lineno=0)
+    add_symbol("RECT", "INT", lineno=0)
+    add_symbol("CIRCLE", "INT", lineno=0)
+    add_symbol("FILL", "INT", lineno=0)
+    add_symbol("BLIT", "INT", lineno=0)
+    add_symbol("FRAME", "INT", lineno=0)
+
+    add_symbol("READ", "INT", lineno=0)
+    add_symbol("WRITE", "INT", lineno=0)
+
+
+def init_machine(vm):
+    """Inicializar tartaruga e video com os valores de `.INIT`, se houver."""
+    args = {}
+    obj = vm.symtable.get_symbol("__turtle")
+    if obj:
+        obj = obj["value"]
+        args["x"] = obj.x
+        args["y"] = obj.y
+        obj = vm.symtable.get_symbol("__window")
+        if not obj:
+            raise Exception("InternalError: Window object undefined.")
+        obj = obj["value"]
+        args["width"] = obj.w
+        args["height"] = obj.h
+    vm.init(**args)
+
+
+def run_file(options, vm=None, assembler=None):
+    """Montar e executar um programa em uma LogoVM nova."""
+    filename = options.filename
+    if vm is None:
+        vm = create_vm(options)
+    vm.activate()
+    add_internal_functions()
+    welcome(filename)
+
+    try:
+        if filename.endswith(".lbo"):
+            start = load_object(filename)
+        elif assembler is not None:
+            start = assembler.parse_program()
+        else:
+            start = assemble(filename, options)
+    except IllegalCharacter as illchar:
+        logging.exception(str(illchar))
+    except UndefinedReference as unref:
+        logging.exception(str(unref))
+    except ObjectFileError as objerr:
+        logging.error(str(objerr))
+    except LinkError as linkerr:
+        logging.error(str(linkerr))
+    else:
+        if start is None:
+            return 2
+        if options.optimize:
+            removed = optimize_program()
+            logging.info("Peephole: %d instructions removed.", removed)
+        if options.object:
+            write_object(options.object, start)
+            return 0
+        if not start:
+            logging.error("Missing '.START' in program: %s", filename)
+            return 2
+        try:
+            init_machine(vm)
+            return run_program(vm, start, options)
+        except KeyboardInterrupt:
+            logging.exception("SIGINT: Keyboard interrupt.")
+    return 1
+
+
+def modification_time(filename):
+    """Obter o instante da ultima alteracao do arquivo, se ele existir."""
+    try:
+        return os.stat(filename).st_mtime_ns
+    except FileNotFoundError:
+        # Alguns editores removem o arquivo antes de salva-lo.
+        return None
+
+
+def watch_file(options):
+    """Executar o programa de novo sempre que o fonte ou um modulo mudar."""
+    filename = options.filename
+    if filename.endswith(".lbo"):
+        logging.error("Cannot watch an object file: %s", filename)
+        return 2
+    assembler = IncrementalAssembler(filename, options.lexer, options.parser)
+    watched = {filename: None}
+    try:
+        while True:
+            current = {name: modification_time(name) for name in watched}
+            if current[filename] is not None and current != watched:
+                try:
+                    status = run_file(options, assembler=assembler)
+                    logging.info("Program finished with status %d.", status)
+                except Exception:  # pylint: disable=broad-except
+                    logging.exception("Program failed.")
+                # Vigiar tambem os modulos importados na ultima montagem.
+                watched = {
+                    name: current.get(name) or modification_time(name)
+                    for name in [filename, *sorted(assembler.modules)]
+                }
+                logging.info("Watching '%s'...", filename)
+            time.sleep(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        return 0
+
+
+def main():
+    """Ponto de entrada para o LogoVM."""
+    if sys.argv[1:2] == ["batch"]:
+        from logovm.batch import main as batch_main
+
+        return batch_main(sys.argv[2:])
+    options = parse_command_line()
+    if options.watch:
+        return watch_file(options)
+    return run_file(options)
+
+
+if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -1,255 +1,433 @@
-#Funções Globais quq a LogoVM usa
-
-try:
-    from PIL import Image
-except ImportError:
-    HAS_PIL_IMAGE = False
-else:
-    HAS_PIL_IMAGE = True
-
-
-__turtle_default = (0, 0)
-__turtle = (0, 0)
-__window = None
-
-flags = 0
-reg = [None] * 6
-stack = []
-pc_stack = []
-image_format = "PNG"
-
-MAXSTACKSIZE = 256 * (2**20)
-
-class Flags:
-    """Flag mappings."""
-
-    PEN = 1
-    DRAW = 2
-    ERASE = 3
-    _UNUSED = 4
-    EXC = 5
-    VERR = 15
-    MAXFLAG = VERR
-
-
-def __get_flag_index(flag):
-    """Ensure flag index is valid."""
-    flag = int(flag)
-    if not 1 <= flag <= Flags.MAXFLAG:
-        raise ValueError("Flag index must be in [1,{Flags.MAXFLAG}]")
-    return flag
-
-
-def set_flag(flag):
-    """Set a flag."""
-    global flags
-    logging.debug("BSET: %s: 0b%s", flag, f"{flags:0{Flags.MAXFLAG+1}b}")
-    flag = __get_flag_index(flag)
-    flags |= 1 << flag
-    logging.debug("SET: %s: 0b%s", flag, f"{flags:0{Flags.MAXFLAG+1}b}")
-
-
-def unset_flag(flag):
-    """Unset a flag."""
-    global flags
-    logging.debug("BUNSET: %s: 0b%s", flag, f"{flags:0{Flags.MAXFLAG+1}b}")
-    flag = __get_flag_index(flag)
-    flags &= ~(1 << flag)
-    logging.debug("UNSET: %s: 0b%s", flag, f"{flags:0{Flags.MAXFLAG+1}b}")
-
-
-def isset(flag):
-    """Check if a flag is set."""
-    logging.debug("ISSET: %d %s", flag, f"{flags:0{Flags.MAXFLAG+1}b}")
-    return bool(flags & (1 << __get_flag_index(flag)))
-
-
-def __init_video(width, height):
-    """Initialize video memory."""
-    global __window
-    bpp = 1
-    vidmem = [0] * (height * width * bpp)
-    logging.debug(
-        "width=%d  height=%d  bpp=%d  stride=%d",
-        width,
-        height,
-        bpp,
-        width * bpp,
-    )
-    __window = [width, height, bpp, width * bpp, vidmem]
-
-
-def reset_video():
-    """Resetar o video da memoria."""
-    __init_video(__window[0], __window[1])
-    unset_flag(Flags.DRAW)
-
-
-def __save_video(filename):
-    """Salvar memória de vídeo em um nome de arquivo filename."""
-    logging.debug("save_video: %s", filename)
-    if isset(Flags.VERR):
-        logging.warning("A video error occured.")
-    if isset(Flags.DRAW):
-        if HAS_PIL_IMAGE and image_format.lower() in ["jpg", "png"]:
-            __save_as_PIL(filename)
-        elif image_format.lower() in ["ppm", "pnm", "pgm", "netpbm", "pbm"]:
-            __save_as_PPM(filename)
-
-
-def __save_as_PIL(filename):
-    logging.debug("Saving with PIL: %s %s", filename, image_format)
-    logging.debug("WINDOW: %s", repr(__window))
-    width, height, bpp, _stride, data = __window
-    data = bytes(data)
-    mode = "L" if bpp == 1 else "RGB"
-    img = Image.frombytes(mode, (width, height), data)
-    img.save(f"{filename}.{image_format.lower()}")
-
-
-def __save_as_PPM(filename):
-    logging.debug("Saving PNM: %s", filename)
-    logging.debug("WINDOW: %s", repr(__window))
-    width, height, bpp, stride, data = __window
-    mode = "P2" if bpp == 1 else "P3"
-    ext = "pgm" if bpp == 1 else "ppm"
-    with open(f"{filename}.{ext}", "w", encoding="ascii") as out:
-        print(mode, file=out)
-        print(f"# {filename}.{ext}", file=out)
-        print(f"{width} {height}", file=out)
-        print("255", file=out)
-        if isset(Flags.VERR):
-            print("# WARNING: A video error occured.", file=out)
-        for j in range(height):
-            start = stride * j
-            print(
-                " ".join(str(v) for v in data[start : start + stride]),
-                file=out,
-            )
-            print("".join(f"{v: 4d}" for v in data[start : start + stride]))
-
-
-def __plot(x, y, color=255):
-    """Defina um pixel com a cor dada."""
-    width, height, bpp, stride, vidmem = __window
-    logging.debug("params: x=%s y=%s width=%s height=%s", x, y, width, height)
-    if not 0 <= x < width:
-        return
-    if not 0 <= y < height:
-        return
-    if isinstance(color, (int, float)):
-        color = [int(color)]
-    else:
-        color = [int(v) for v in color]
-    if len(color) != bpp:
-        set_flag(Flags.VERR)
-        if bpp == 1:
-            color = sum(color, 0) // len(color)
-        else:
-            color = color * 3
-    color = color[0] if bpp == 1 else color
-    x = round(x)
-    y = round(y)
-    position = stride * y + x * bpp
-    vidmem[position] = color
-    logging.debug("vidmem:x=%s y=%s c=%s pos=%s", x, y, color, position)
-    set_flag(Flags.DRAW)
-
-
-def set_pixel():
-    """Implementar a instrucao: SETPX."""
-    if isset(Flags.PEN):
-        __plot(*__turtle[:2], 0 if isset(Flags.ERASE) else 255)
-
-
-def draw_line():
-    """Desenhe um segmento de linha na memória de vídeo da posição atual até o alvo."""
-    x0, y0, x1, y1 = reg[:6]
-    logging.debug("x0=%d y0=%d x1=%d y1=%d", x0, y0, x1, y1)
-    if isset(Flags.PEN):
-        dx = abs(x1 - x0)
-        sx = copysign(1, x1 - x0)
-        dy = -abs(y1 - y0)
-        sy = copysign(1, y1 - y0)
-        error = dx + dy
-
-        while True:
-            __plot(x0, y0)
-            if round(x0) == round(x1) and round(y0) == round(y1):
-                break
-            error2 = 2 * error
-            logging.debug("dx %s dy %s error %s e2 %s", dx, dy, error, error2)
-            if error2 >= dy:
-                if round(x0) == round(x1):
-                    break
-                error = error + dy
-                x0 = x0 + sx
-            if error2 <= dx:
-                if round(y0) == round(y1):
-                    break
-                error = error + dx
-                y0 = y0 + sy
-
-    stack_push(x1, y1)
-    set_pos()
-
-
-def get_pos():
-    """Obtenha a posição do ponteiro como (R0, R1)."""
-    logging.debug("TURTLE: %s", repr(__turtle))
-    reg[0] = __turtle[0]
-    reg[1] = __turtle[1]
-    return (reg[0], reg[1])
-
-
-def set_pos():
-    """Defina a posição do ponteiro para (R0, R1)."""
-    global __turtle
-    _, _, *extra = __turtle
-    reg[1] = stack_pop()
-    reg[0] = stack_pop()
-    __turtle = (reg[0], reg[1], *extra)
-    logging.debug("TURTLE: %s", repr(__turtle))
-
-def stack_peek():
-    """Peek valor no topo da pilha."""
-    return stack[-1] if stack else None
-
-
-def stack_pop():
-    """Retirar um valor da pilha."""
-    if not stack:
-        raise EmptyStackError()
-    value = stack.pop()
-    logging.debug("STACK: %s", repr(stack))
-    return value
-
-
-def stack_push(*args):
-    """Empurre um valor para a pilha."""
-    for value in args:
-        if len(stack) < MAXSTACKSIZE:
-            stack.append(value)
-        else:
-            raise StackOverflowError()
-    logging.debug("STACK: %s", repr(stack))
-
-
-def halt():
-    """Delisgamento da maquina."""
-    filename = datetime.now().strftime("%Y%m%d-%H%M%S.%s")
-    logging.debug("HALT: %s %s", filename, image_format)
-    pc_stack.clear()
-    __save_video(filename)
-
-
-def init(**kwargs):
-
-    global __turtle
-    global __turtle_default
-    width, height = kwargs.get("width", 456), kwargs.get("height", 182)
-    x, y = kwargs.get("x", width // 2), kwargs.get("y", height // 2)
-    __turtle_default = (x, y)
-    __turtle = (x, y)
-    __init_video(width, height)
-    unset_flag(Flags.DRAW)
\ No newline at end of file
+#Funções Globais quq a LogoVM usa
+
+import ctypes
+import logging
+from datetime import datetime
+from math import copysign, isqrt
+
+from logovm.errors import EmptyStackError, StackOverflowError
+
+try:
+    from PIL import Image
+except ImportError:
+    HAS_PIL_IMAGE = False
+else:
+    HAS_PIL_IMAGE = True
+
+
+MAXSTACKSIZE = 256 * (2**20)
+# Limiar das imagens de 1 bit, o mesmo do PIL em convert("1").
+MONO_THRESHOLD = 128
+
+
+def save_netpbm(filename, mode, width, height, data, comments=()):
+    """Salvar `data` como imagem Netpbm binaria (P4, P5 ou P6)."""
+    header = [mode, *(f"# {comment}" for comment in comments)]
+    header.append(f"{width} {height}")
+    if mode != "P4":
+        header.append("255")
+    with open(filename, "wb") as out:
+        out.write(("\n".join(header) + "\n").encode("ascii"))
+        out.write(data)
+    return filename
+
+class Flags:
+    """Flag mappings."""
+
+    PEN = 1
+    DRAW = 2
+    ERASE = 3
+    _UNUSED = 4
+    EXC = 5
+    VERR = 15
+    MAXFLAG = VERR
+
+
+class Machine:
+    """Estado da máquina: pilha, registradores, flags, tartaruga e vídeo."""
+
+    def __init__(self, **kwargs):
+        """Inicializar uma máquina vazia, ainda sem memória de vídeo."""
+        self.turtle_default = (0, 0)
+        self.turtle = (0, 0)
+        self.window = None
+        self.dirty = None
+        self.flags = 0
+        self.reg = [None] * 8
+        self.stack = []
+        self.pc_stack = []
+        self.call_stack = []
+        self.image_format = kwargs.get("image_format", "PNG")
+        self.image_mono = kwargs.get("image_mono", False)
+        self.png_compress_level = kwargs.get("png_compress_level", 6)
+        self.image_name = kwargs.get("image_name")
+        self.image_path = None
+        self.tracer = kwargs.get("tracer")
+        self.recorder = None
+
+    @staticmethod
+    def __get_flag_index(flag):
+        """Ensure flag index is valid."""
+        flag = int(flag)
+        if not 1 <= flag <= Flags.MAXFLAG:
+            raise ValueError("Flag index must be in [1,{Flags.MAXFLAG}]")
+        return flag
+
+    def set_flag(self, flag):
+        """Set a flag."""
+        flag = self.__get_flag_index(flag)
+        self.flags |= 1 << flag
+        if self.tracer is not None:
+            self.tracer.flag(flag, self.flags)
+
+    def unset_flag(self, flag):
+        """Unset a flag."""
+        flag = self.__get_flag_index(flag)
+        self.flags &= ~(1 << flag)
+        if self.tracer is not None:
+            self.tracer.flag(flag, self.flags)
+
+    def isset(self, flag):
+        """Check if a flag is set."""
+        return bool(self.flags & (1 << self.__get_flag_index(flag)))
+
+    def __init_video(self, width, height):
+        """Initialize video memory."""
+        bpp = 1
+        vidmem = bytearray(height * width * bpp)
+        logging.debug(
+            "width=%d  height=%d  bpp=%d  stride=%d",
+            width,
+            height,
+            bpp,
+            width * bpp,
+        )
+        self.window = [width, height, bpp, width * bpp, vidmem]
+
+    def video_mode(self):
+        """Obter largura, altura e bytes por pixel da memória de vídeo."""
+        return tuple(self.window[:3])
+
+    def __mark_dirty(self, x0, y0, x1, y1):
+        """Incluir o retângulo [x0, x1) x [y0, y1) na região alterada."""
+        if self.dirty is None:
+            self.dirty = [x0, y0, x1, y1]
+        else:
+            box = self.dirty
+            box[0], box[1] = min(box[0], x0), min(box[1], y0)
+            box[2], box[3] = max(box[2], x1), max(box[3], y1)
+
+    def save_frame(self):
+        """Enviar ao gravador a região alterada desde o último quadro."""
+        if self.recorder is None:
+            return
+        box, self.dirty = self.dirty, None
+        rows = []
+        if box is not None:
+            x0, y0, x1, y1 = box
+            _, _, bpp, stride, vidmem = self.window
+            rows = [
+                bytes(vidmem[j * stride + x0 * bpp : j * stride + x1 * bpp])
+                for j in range(y0, y1)
+            ]
+        self.recorder.push(box, rows)
+
+    def reset_video(self):
+        """Resetar o video da memoria."""
+        vidmem = self.window[4]
+        # Zerar no lugar, sem criar uma copia do tamanho da tela.
+        ctypes.memset(
+            (ctypes.c_char * len(vidmem)).from_buffer(vidmem), 0, len(vidmem)
+        )
+        if self.recorder is not None:
+            self.__mark_dirty(0, 0, *self.window[:2])
+        self.unset_flag(Flags.DRAW)
+
+    def __save_video(self, filename):
+        """Salvar memória de vídeo em um nome de arquivo filename."""
+        logging.debug("save_video: %s", filename)
+        if self.isset(Flags.VERR):
+            logging.warning("A video error occured.")
+        if self.isset(Flags.DRAW):
+            image_format = self.image_format.lower()
+            if HAS_PIL_IMAGE and image_format in ["jpg", "png"]:
+                self.image_path = self.__save_as_PIL(filename)
+            elif self.image_mono or image_format == "pbm":
+                self.image_path = self.__save_as_PBM(filename)
+            elif image_format in ["ppm", "pnm", "pgm", "netpbm"]:
+                self.image_path = self.__save_as_PPM(filename)
+
+    def __save_as_PIL(self, filename):
+        logging.debug("Saving with PIL: %s %s", filename, self.image_format)
+        width, height, bpp, stride, data = self.window
+        mode = "L" if bpp == 1 else "RGB"
+        img = Image.frombuffer(
+            mode, (width, height), data, "raw", mode, stride, 1
+        )
+        options = {}
+        if self.image_mono:
+            img = img.convert("1", dither=Image.Dither.NONE)
+        if self.image_format.lower() == "png":
+            options["compress_level"] = self.png_compress_level
+        filename = f"{filename}.{self.image_format.lower()}"
+        img.save(filename, **options)
+        return filename
+
+    def __save_as_netpbm(self, filename, mode, ext, data):
+        """Salvar `data` com o cabeçalho Netpbm da janela."""
+        width, height = self.window[:2]
+        comments = [f"{filename}.{ext}"]
+        if self.isset(Flags.VERR):
+            comments.append("WARNING: A video error occured.")
+        return save_netpbm(
+            f"{filename}.{ext}", mode, width, height, data, comments
+        )
+
+    def __save_as_PPM(self, filename):
+        logging.debug("Saving PNM: %s", filename)
+        bpp, data = self.window[2], self.window[4]
+        mode = "P5" if bpp == 1 else "P6"
+        ext = "pgm" if bpp == 1 else "ppm"
+        return self.__save_as_netpbm(filename, mode, ext, data)
+
+    def __save_as_PBM(self, filename):
+        """Salvar a memória de vídeo como bitmap PBM (P4) de 1 bit."""
+        logging.debug("Saving PBM: %s", filename)
+        width, height, bpp, stride, data = self.window
+        # No PBM, 1 e preto: pixels abaixo do limiar viram '1'.
+        bits = b"1" * MONO_THRESHOLD + b"0" * (256 - MONO_THRESHOLD)
+        padding = b"0" * (-width % 8)
+        size = (width + len(padding)) // 8
+        rows = []
+        for j in range(height):
+            row = data[j * stride : (j + 1) * stride : bpp].translate(bits)
+            rows.append(int(row + padding, 2).to_bytes(size, "big"))
+        return self.__save_as_netpbm(filename, "P4", "pbm", b"".join(rows))
+
+    def __plot(self, x, y, color=255):
+        """Defina um pixel com a cor dada."""
+        width, height, bpp, stride, vidmem = self.window
+        x = round(x)
+        y = round(y)
+        if not 0 <= x < width:
+            return
+        if not 0 <= y < height:
+            return
+        if isinstance(color, (int, float)):
+            color = [int(color)]
+        else:
+            color = [int(v) for v in color]
+        if len(color) != bpp:
+            self.set_flag(Flags.VERR)
+            color = [sum(color, 0) // len(color)] * bpp
+        color = bytes(min(max(v, 0), 255) for v in color)
+        position = stride * y + x * bpp
+        vidmem[position : position + bpp] = color
+        if self.tracer is not None:
+            self.tracer.pixel(x, y, color)
+        if self.recorder is not None:
+            self.__mark_dirty(x, y, x + 1, y + 1)
+        self.set_flag(Flags.DRAW)
+
+    def set_pixel(self):
+        """Implementar a instrucao: SETPX."""
+        if self.isset(Flags.PEN):
+            color = 0 if self.isset(Flags.ERASE) else 255
+            self.__plot(*self.turtle[:2], color)
+
+    def __pen_color(self):
+        """Obter os bytes de um pixel na cor da caneta, ou None sem caneta."""
+        if not self.isset(Flags.PEN):
+            return None
+        color = 0 if self.isset(Flags.ERASE) else 255
+        return bytes([color]) * self.window[2]
+
+    def __clip(self, x, y, w, h):
+        """Recortar o retângulo à janela; devolve (x0, y0, x1, y1)."""
+        width, height = self.window[:2]
+        x0, y0 = max(round(x), 0), max(round(y), 0)
+        x1, y1 = min(round(x + w), width), min(round(y + h), height)
+        return x0, y0, x1, y1
+
+    def fill_rect(self, x, y, w, h):
+        """Preencher um retângulo com a cor da caneta, uma fatia por linha."""
+        color = self.__pen_color()
+        x0, y0, x1, y1 = self.__clip(x, y, w, h)
+        if color is None or x0 >= x1 or y0 >= y1:
+            return
+        _, _, bpp, stride, vidmem = self.window
+        span = color * (x1 - x0)
+        for row in range(y0 * stride + x0 * bpp, y1 * stride, stride):
+            vidmem[row : row + len(span)] = span
+        if self.recorder is not None:
+            self.__mark_dirty(x0, y0, x1, y1)
+        self.set_flag(Flags.DRAW)
+
+    def fill_circle(self, x, y, radius):
+        """Preencher um círculo com a cor da caneta, uma fatia por linha."""
+        color = self.__pen_color()
+        if color is None or radius < 0:
+            return
+        width, height, bpp, stride, vidmem = self.window
+        x, y = round(x), round(y)
+        radius = round(radius)
+        for j in range(max(y - radius, 0), min(y + radius + 1, height)):
+            half = isqrt(radius * radius - (j - y) ** 2)
+            x0, x1 = max(x - half, 0), min(x + half + 1, width)
+            if x0 < x1:
+                row = j * stride
+                vidmem[row + x0 * bpp : row + x1 * bpp] = color * (x1 - x0)
+        if self.recorder is not None:
+            self.__mark_dirty(
+                max(x - radius, 0),
+                max(y - radius, 0),
+                min(x + radius + 1, width),
+                min(y + radius + 1, height),
+            )
+        self.set_flag(Flags.DRAW)
+
+    def flood_fill(self, x, y):
+        """Preencher, por linhas de varredura, a região da cor de (x, y)."""
+        color = self.__pen_color()
+        width, height, bpp, stride, vidmem = self.window
+        x, y = round(x), round(y)
+        if color is None or not (0 <= x < width and 0 <= y < height):
+            return
+        if bpp != 1:
+            self.set_flag(Flags.VERR)
+            return
+        target = vidmem[y * stride + x : y * stride + x + 1]
+        if target == color:
+            return
+        seeds = [(x, y)]
+        while seeds:
+            x, y = seeds.pop()
+            row = y * stride
+            if vidmem[row + x] != target[0]:
+                continue
+            left = vidmem[row : row + x + 1]
+            left = x - (len(left) - len(left.rstrip(target))) + 1
+            right = vidmem[row + x : row + width]
+            right = x + (len(right) - len(right.lstrip(target)))
+            vidmem[row + left : row + right] = color * (right - left)
+            if self.recorder is not None:
+                self.__mark_dirty(left, y, right, y + 1)
+            for j in (y - 1, y + 1):
+                if not 0 <= j < height:
+                    continue
+                segment = vidmem[j * stride + left : j * stride + right]
+                i = segment.find(target)
+                while i >= 0:
+                    seeds.append((left + i, j))
+                    run = segment[i:]
+                    i += len(run) - len(run.lstrip(target))
+                    i = segment.find(target, i)
+        self.set_flag(Flags.DRAW)
+
+    def blit(self, sx, sy, w, h, dx, dy):
+        """Copiar um retângulo do vídeo de (sx, sy) para (dx, dy)."""
+        _, _, bpp, stride, vidmem = self.window
+        sx0, sy0, sx1, sy1 = self.__clip(sx, sy, w, h)
+        dx, dy = round(dx) + sx0 - round(sx), round(dy) + sy0 - round(sy)
+        dx0, dy0, dx1, dy1 = self.__clip(dx, dy, sx1 - sx0, sy1 - sy0)
+        if dx0 >= dx1 or dy0 >= dy1:
+            return
+        sx0, sy0 = (sx0 + dx0 - dx) * bpp, sy0 + dy0 - dy
+        span = (dx1 - dx0) * bpp
+        rows = [
+            bytes(vidmem[j * stride + sx0 : j * stride + sx0 + span])
+            for j in range(sy0, sy0 + dy1 - dy0)
+        ]
+        for j, data in zip(range(dy0, dy1), rows):
+            start = j * stride + dx0 * bpp
+            vidmem[start : start + span] = data
+        if self.recorder is not None:
+            self.__mark_dirty(dx0, dy0, dx1, dy1)
+        self.set_flag(Flags.DRAW)
+
+    def draw_line(self):
+        """Desenhe um segmento de linha da posição atual até o alvo."""
+        x0, y0, x1, y1 = self.reg[:4]
+        logging.debug("x0=%d y0=%d x1=%d y1=%d", x0, y0, x1, y1)
+        if self.isset(Flags.PEN):
+            dx = abs(x1 - x0)
+            sx = copysign(1, x1 - x0)
+            dy = -abs(y1 - y0)
+            sy = copysign(1, y1 - y0)
+            error = dx + dy
+
+            while True:
+                self.__plot(x0, y0)
+                if round(x0) == round(x1) and round(y0) == round(y1):
+                    break
+                error2 = 2 * error
+                if error2 >= dy:
+                    if round(x0) == round(x1):
+                        break
+                    error = error + dy
+                    x0 = x0 + sx
+                if error2 <= dx:
+                    if round(y0) == round(y1):
+                        break
+                    error = error + dx
+                    y0 = y0 + sy
+
+        self.stack_push(x1, y1)
+        self.set_pos()
+
+    def get_pos(self):
+        """Obtenha a posição do ponteiro como (R0, R1)."""
+        reg = self.reg
+        reg[0] = self.turtle[0]
+        reg[1] = self.turtle[1]
+        return (reg[0], reg[1])
+
+    def set_pos(self):
+        """Defina a posição do ponteiro para (R0, R1)."""
+        reg = self.reg
+        _, _, *extra = self.turtle
+        reg[1] = self.stack_pop()
+        reg[0] = self.stack_pop()
+        self.turtle = (reg[0], reg[1], *extra)
+
+    def stack_peek(self):
+        """Peek valor no topo da pilha."""
+        return self.stack[-1] if self.stack else None
+
+    def stack_pop(self):
+        """Retirar um valor da pilha."""
+        stack = self.stack
+        if not stack:
+            raise EmptyStackError()
+        value = stack.pop()
+        if self.tracer is not None:
+            self.tracer.stack(stack)
+        return value
+
+    def stack_push(self, *args):
+        """Empurre um valor para a pilha."""
+        stack = self.stack
+        if len(stack) + len(args) > MAXSTACKSIZE:
+            raise StackOverflowError()
+        stack.extend(args)
+        if self.tracer is not None:
+            self.tracer.stack(stack)
+
+    def halt(self):
+        """Delisgamento da maquina."""
+        filename = self.image_name
+        if filename is None:
+            filename = datetime.now().strftime("%Y%m%d-%H%M%S.%s")
+        logging.debug("HALT: %s %s", filename, self.image_format)
+        self.pc_stack.clear()
+        self.call_stack.clear()
+        self.__save_video(filename)
+
+    def init(self, **kwargs):
+        """Inicializar a tartaruga e a memória de vídeo."""
+        width, height = kwargs.get("width", 456), kwargs.get("height", 182)
+        x, y = kwargs.get("x", width // 2), kwargs.get("y", height // 2)
+        self.turtle_default = (x, y)
+        self.turtle = (x, y)
+        self.__init_video(width, height)
+        self.unset_flag(Flags.DRAW)
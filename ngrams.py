@@ -0,0 +1,102 @@
+"""Minerar sequencias frequentes de opcodes para superinstrucoes.
+
+    python -m logovm.ngrams [-s SIZES] [-t TOP] [-w FILE] programa...
+
+Executa cada programa com um NgramTracer (e, portanto, sem
+superinstrucoes), soma as contagens e lista as sequencias mais
+frequentes, ordenadas pelos despachos que uma fusao economizaria.
+Sequencias com desvios ou chamadas nao podem ser fundidas; as que ja tem
+uma fusao especializada sao indicadas. Com `--write`, as demais
+sequencias da lista sao gravadas em FILE, para `main --fusions FILE`.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+from collections import Counter
+
+from logovm.fusion import CONTROL, SPECIALIZED
+from logovm.main import cli_parser, create_vm, run_file
+from logovm.tracer import NgramTracer, set_tracer
+
+
+class Collector(NgramTracer):
+    """NgramTracer sem relatorio por programa; `main` faz o resumo."""
+
+    def report(self, top=20):
+        """Nao registrar nada ao final de cada programa."""
+
+
+def profile(programs, sizes):
+    """Executar os programas e somar as contagens de sequencias."""
+    ngrams = Counter()
+    for program in programs:
+        # Sem parse_command_line, que reconfigura o logging a cada programa.
+        options = cli_parser(["--", *program.split()])
+        vm = create_vm(options)
+        tracer = Collector(vm, sizes)
+        set_tracer(vm, tracer)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_file(options, vm)
+        ngrams.update(tracer.ngrams)
+    return ngrams
+
+
+def status(ngram):
+    """Classificar uma sequencia: especializada, fundivel ou nao."""
+    if ngram in SPECIALIZED:
+        return "specialized"
+    if any(op in CONTROL or op in ("CALL", "LABEL") for op in ngram):
+        return "-"
+    return "proposed"
+
+
+def main(args=None):
+    """Ponto de entrada do minerador de sequencias."""
+    parser = argparse.ArgumentParser(
+        prog="ngrams", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        default="2,3,4",
+        help="Comma separated sequence sizes (default: 2,3,4).",
+    )
+    parser.add_argument("-t", "--top", type=int, default=20)
+    parser.add_argument(
+        "-w", "--write", metavar="FILE", help="Write proposed fusions."
+    )
+    parser.add_argument(
+        "programs",
+        nargs="+",
+        help="Programs to profile; quote 'program args' to pass arguments.",
+    )
+    options = parser.parse_args(args)
+    sizes = tuple(int(size) for size in options.sizes.split(","))
+
+    ngrams = profile(options.programs, sizes)
+    ranking = sorted(
+        ngrams.items(),
+        key=lambda item: item[1] * (len(item[0]) - 1),
+        reverse=True,
+    )[: options.top]
+    print(f"{'saved':>10s} {'count':>10s}  {'status':12s} sequence")
+    proposed = []
+    for ngram, count in ranking:
+        kind = status(ngram)
+        if kind == "proposed":
+            proposed.append(list(ngram))
+        print(
+            f"{count * (len(ngram) - 1):10d} {count:10d}  {kind:12s}"
+            f" {'; '.join(ngram)}"
+        )
+    if options.write:
+        with open(options.write, "wt", encoding="utf-8") as output:
+            json.dump({"sequences": proposed}, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
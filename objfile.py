@@ -0,0 +1,178 @@
+"""Formato objeto `.lbo` para programas LogoASM montados.
+
+Layout do arquivo (inteiros little-endian):
+
+    cabecalho   "<4sHHIII": magic, versao, reservado, numero de
+                instrucoes, numero de relocacoes, tamanho dos metadados
+    codigo      int32[2 * n]: pares (opcode, operando)
+    linhas      int32[n]: linha de origem de cada instrucao
+    relocacoes  int32[r]: instrucoes cujo operando e um simbolo
+    metadados   JSON: tabela de opcodes, pool de constantes e simbolos
+
+O operando e um indice no pool de constantes, ou, para as instrucoes
+listadas em relocacoes, um indice na tabela de simbolos; -1 indica
+instrucao sem operando. O codigo de cada procedimento e o intervalo
+[inicio, fim) do vetor de instrucoes.
+"""
+
+import json
+import struct
+from array import array
+from types import SimpleNamespace
+
+from logoasm.symtable import add_symbol, get_symbol, iter_symbols
+
+MAGIC = b"LBO\0"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+SYMBOL_OPERANDS = ("LOAD", "STOR", "CALL", "CMP", "LABEL", "JP", "JZ", "JNZ")
+SYMBOL_OPERANDS += ("JMORE", "JLESS")
+
+
+class ObjectFileError(Exception):
+    """Erro gerado ao ler um arquivo objeto invalido."""
+
+    def __init__(self, filename, msg):
+        """Erro de inicializacao com mensagem adequada."""
+        super().__init__(f"Invalid object file '{filename}': {msg}")
+
+
+class ObjectFile:
+    """Conteudo de um arquivo objeto `.lbo`."""
+
+    def __init__(self, start, **kwargs):
+        """Inicializar secoes do objeto."""
+        self.start = start
+        self.opcodes = kwargs.get("opcodes", [])
+        self.constants = kwargs.get("constants", [])
+        self.symbols = kwargs.get("symbols", [])
+        self.code = kwargs.get("code", array("i"))
+        self.lines = kwargs.get("lines", array("i"))
+        self.relocations = kwargs.get("relocations", array("i"))
+        self.relocated = set(self.relocations)
+
+    def instruction(self, index):
+        """Obter o texto LogoASM da instrucao `index`."""
+        opcode = self.opcodes[self.code[2 * index]]
+        operand = self.code[2 * index + 1]
+        if operand < 0:
+            return opcode
+        if index in self.relocated:
+            return f"{opcode} {self.symbols[operand]['name']}"
+        return f"{opcode} {self.constants[operand]}"
+
+
+def __object_value(value):
+    """Converter um ParserObject em dicionario serializavel."""
+    if hasattr(value, "__dict__"):
+        return {"__object__": vars(value)}
+    return value
+
+
+def assemble_object():
+    """Gerar um ObjectFile a partir da tabela de simbolos montada."""
+    obj = ObjectFile(None)
+    opcodes, constants, symbols = {}, {}, {}
+    for name, _ in iter_symbols():
+        symbols[name] = len(symbols)
+    for _, data in iter_symbols():
+        entry = {
+            k: __object_value(v)
+            for k, v in data.items()
+            if k not in ("code", "lines", "ops", "slot")
+        }
+        code = data.get("code")
+        if code is not None:
+            entry["code"] = [len(obj.lines), len(obj.lines) + len(code)]
+            for text, lineno in zip(code, data["lines"]):
+                opcode, *operand = text.split(" ", 1)
+                index = len(obj.lines)
+                obj.code.append(opcodes.setdefault(opcode, len(opcodes)))
+                if not operand:
+                    obj.code.append(-1)
+                elif opcode in SYMBOL_OPERANDS and operand[0] in symbols:
+                    obj.relocations.append(index)
+                    obj.code.append(symbols[operand[0]])
+                else:
+                    obj.code.append(
+                        constants.setdefault(operand[0], len(constants))
+                    )
+                obj.lines.append(lineno or 0)
+        obj.symbols.append(entry)
+    obj.opcodes = list(opcodes)
+    obj.constants = list(constants)
+    return obj
+
+
+def write_object(filename, start):
+    """Salvar o programa montado no arquivo objeto `filename`."""
+    obj = assemble_object()
+    meta = json.dumps(
+        {
+            "start": start,
+            "opcodes": obj.opcodes,
+            "constants": obj.constants,
+            "symbols": obj.symbols,
+        }
+    ).encode("utf-8")
+    with open(filename, "wb") as output:
+        count, nrelocs = len(obj.lines), len(obj.relocations)
+        output.write(HEADER.pack(MAGIC, VERSION, 0, count, nrelocs, len(meta)))
+        output.write(obj.code.tobytes())
+        output.write(obj.lines.tobytes())
+        output.write(obj.relocations.tobytes())
+        output.write(meta)
+
+
+def read_object(filename):
+    """Ler um arquivo objeto, sem reconstruir a tabela de simbolos."""
+    with open(filename, "rb") as source:
+        data = memoryview(source.read())
+    if len(data) < HEADER.size:
+        raise ObjectFileError(filename, "truncated header")
+    magic, version, _, count, nrelocs, metasize = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ObjectFileError(filename, f"unsupported format: {version}")
+    offset = HEADER.size
+    sections = {}
+    for name, size in (("code", 2 * count), ("lines", count)):
+        sections[name] = array("i")
+        sections[name].frombytes(data[offset : offset + 4 * size])
+        offset += 4 * size
+    sections["relocations"] = array("i")
+    sections["relocations"].frombytes(data[offset : offset + 4 * nrelocs])
+    offset += 4 * nrelocs
+    if len(data) != offset + metasize:
+        raise ObjectFileError(filename, "size mismatch")
+    meta = json.loads(bytes(data[offset:]).decode("utf-8"))
+    return ObjectFile(
+        meta["start"],
+        opcodes=meta["opcodes"],
+        constants=meta["constants"],
+        symbols=meta["symbols"],
+        **sections,
+    )
+
+
+def __parser_value(value):
+    """Reconstruir objetos salvos por __object_value."""
+    if isinstance(value, dict) and "__object__" in value:
+        return SimpleNamespace(**value["__object__"])
+    return value
+
+
+def load_object(filename):
+    """Carregar o arquivo objeto na tabela de simbolos; devolve o inicio."""
+    obj = read_object(filename)
+    for entry in obj.symbols:
+        entry = {k: __parser_value(v) for k, v in entry.items()}
+        name, symtype = entry.pop("name"), entry.pop("type")
+        if "code" in entry:
+            start, end = entry["code"]
+            entry["code"] = [obj.instruction(i) for i in range(start, end)]
+            entry["lines"] = list(obj.lines[start:end])
+        if get_symbol(name) is None:
+            add_symbol(name, symtype, **entry)
+        else:
+            get_symbol(name).update(entry)
+    return obj.start
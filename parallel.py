@@ -0,0 +1,169 @@
+"""Montagem paralela de programas LogoASM grandes.
+
+A secao `.CODE` e dividida nas linhas que comecam com `DEF`, e os blocos
+de procedimentos sao montados em um ProcessPoolExecutor. Cada processo
+monta o cabecalho (`.START`, `.INIT`, `.DATA` e `.CODE`) seguido do seu
+bloco, precedido de linhas vazias para manter os numeros das linhas, e
+retorna o codigo e as linhas dos procedimentos que definiu.
+
+A juncao e feita na tabela de simbolos do processo principal, na ordem
+do programa: o cabecalho e montado de novo, e as referencias de cada
+procedimento (CALL, desvios e etiquetas) sao aplicadas com as mesmas
+acoes do parser antes de definir o procedimento. Assim, as chamadas
+anteriores ao DEF e as contagens de uso ficam como na montagem em serie,
+e `check_references` roda uma unica vez, no fim. Se algum bloco falhar,
+o programa e montado de novo em serie, para relatar o erro como sempre.
+"""
+
+import io
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from logoasm import lineparser, parser
+from logoasm.linker import link_modules
+from logoasm.parser import check_references
+from logoasm.symtable import SymbolTable, get_symbol_table, set_symbol_table
+
+# Programas com menos procedimentos sao montados em serie.
+MIN_PROCEDURES = 256
+# Blocos por processo, para equilibrar a carga entre os processos.
+CHUNKS_PER_JOB = 4
+DEF = re.compile(r"[ \t]*DEF[ \t\r\n]", re.IGNORECASE).match
+REFERENCES = {
+    "CALL": lineparser.call,
+    "JP": lineparser.jump,
+    "JZ": lineparser.jump,
+    "JNZ": lineparser.jump,
+    "JMORE": lineparser.jump,
+    "JLESS": lineparser.jump,
+    "LABEL": lineparser.define_label,
+}
+
+
+def parse_source(source, tokenizer="ply", parser_name="ply"):
+    """Montar `source` com o parser escolhido, sem verificar referencias."""
+    if parser_name == "lines":
+        return lineparser.parse_source(source)
+    return parser.parse_source(source, tokenizer)
+
+
+def parse_serial(filename, tokenizer="ply", parser_name="ply"):
+    """Montar o programa em um unico processo."""
+    if parser_name == "lines":
+        return lineparser.parse_program(filename)
+    return parser.parse_program(filename, tokenizer)
+
+
+def definitions(lines):
+    """Obter os intervalos [inicio, fim) das linhas de cada DEF."""
+    starts = [index for index, line in enumerate(lines) if DEF(line)]
+    return list(zip(starts, starts[1:] + [len(lines)]))
+
+
+def split_program(lines, chunks):
+    """Dividir as linhas em cabecalho e cerca de `chunks` blocos de DEFs."""
+    starts = [begin for begin, _ in definitions(lines)]
+    if len(starts) < MIN_PROCEDURES:
+        return lines, []
+    size = (len(lines) - starts[0]) / chunks
+    blocks = []
+    begin = starts[0]
+    for start in starts[1:]:
+        if start - begin >= size:
+            blocks.append((begin, start))
+            begin = start
+    blocks.append((begin, len(lines)))
+    return lines[: starts[0]], blocks
+
+
+def initial_table():
+    """Copiar os simbolos ja definidos (funcoes da ROM) em uma tabela nova."""
+    symtable = get_symbol_table()
+    initial = SymbolTable(symtable.case_insensitive)
+    for name, symbol in symtable.iter_symbols():
+        attributes = dict(symbol.items())
+        del attributes["name"], attributes["type"]
+        initial.add_symbol(name, symbol["type"], **attributes)
+    return initial
+
+
+def assemble_chunk(task):
+    """Montar um bloco de procedimentos, no processo filho."""
+    tokenizer, parser_name, table, header, gap, chunk = task
+    program = get_symbol_table()
+    set_symbol_table(table)
+    source = io.StringIO("".join([header, "\n" * gap, chunk]))
+    try:
+        if parse_source(source, tokenizer, parser_name) is None:
+            return None
+    except Exception:  # pylint: disable=broad-except
+        # O erro e relatado pela montagem em serie.
+        return None
+    finally:
+        set_symbol_table(program)
+    procedures = [
+        (symbol["lineno"], name, symbol["code"], symbol["lines"])
+        for name, symbol in table.iter_symbols()
+        if symbol.get("code") is not None
+    ]
+    procedures.sort(key=lambda procedure: procedure[0])
+    return procedures
+
+
+def merge_procedures(procedures):
+    """Aplicar as referencias e definir os procedimentos de um bloco."""
+    references = REFERENCES
+    for lineno, name, code, lines in procedures:
+        for text, line in zip(code, lines):
+            opcode, _, operand = text.partition(" ")
+            action = references.get(opcode.upper())
+            if action is not None:
+                action(operand, line)
+        lineparser.define_procedure(name, lineno, code, lines)
+
+
+def parse_program(filename, tokenizer="ply", parser_name="ply", jobs=1):
+    """Montar o programa, em `jobs` processos se ele for grande."""
+    if jobs < 2:
+        return parse_serial(filename, tokenizer, parser_name)
+    with open(filename, "rt") as input_file:
+        lines = input_file.readlines()
+    header, blocks = split_program(lines, jobs * CHUNKS_PER_JOB)
+    if len(blocks) < 2:
+        return parse_serial(filename, tokenizer, parser_name)
+
+    # Cada processo comeca com os simbolos ja definidos (funcoes da ROM).
+    initial = initial_table()
+    header_text = "".join(header)
+    tasks = [
+        (
+            tokenizer,
+            parser_name,
+            initial,
+            header_text,
+            begin - len(header),
+            "".join(lines[begin:end]),
+        )
+        for begin, end in blocks
+    ]
+    del lines
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(assemble_chunk, tasks))
+    if None in results:
+        logging.info("Parallel assembly failed, assembling serially.")
+        return parse_serial(filename, tokenizer, parser_name)
+    logging.debug("Assembled %d blocks in %d processes.", len(results), jobs)
+
+    start_symbol = parse_source(
+        io.StringIO(header_text), tokenizer, parser_name
+    )
+    for procedures in results:
+        merge_procedures(procedures)
+    link_modules(
+        filename,
+        start_symbol,
+        lambda source: parse_source(source, tokenizer, parser_name),
+    )
+    check_references()
+    return start_symbol
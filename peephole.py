@@ -0,0 +1,312 @@
+"""Otimizador peephole do codigo montado pelo LogoASM.
+
+Trabalha sobre o texto das instrucoes de cada procedimento (atributos
+`code` e `lines` dos simbolos FUNC), antes da carga do programa:
+
+    - dobra aritmetica constante: PUSH 2; PUSH 20; MUL -> PUSH 40
+    - remove STOR x; LOAD x quando `x` so e lido nesses pares
+    - encurta cadeias de desvios (JP a; ... a: JP b -> JP b)
+    - remove codigo inalcancavel e etiquetas sem referencia
+    - remove o CMP 0 depois de SUB (PUSH n; SUB; CMP 0 -> PUSH n; SUB)
+
+As transformacoes preservam a pilha e o sinal de R0, que e o que os
+desvios condicionais observam. Procedimentos com JR (desvio relativo)
+nao sao alterados, e a instrucao saltada por SKIPZ/SKIPNZ nunca e
+removida nem fundida com outras.
+"""
+
+import logging
+import math
+import operator
+
+from logoasm.symtable import get_symbol, get_symbols_by_class, set_symbol
+
+ARITHMETIC = {
+    "ADD": operator.add,
+    "SUB": operator.sub,
+    "MUL": operator.mul,
+    "DIV": operator.truediv,
+    "POW": operator.pow,
+    "AND": operator.and_,
+    "OR": operator.or_,
+    "XOR": operator.xor,
+    "SHFTR": operator.rshift,
+    "SHFTL": operator.lshift,
+}
+CONDITIONS = ("JZ", "JNZ", "JMORE", "JLESS")
+SKIPS = ("SKIPZ", "SKIPNZ")
+TERMINATORS = ("JP", "RET", "HALT")
+R0_READERS = CONDITIONS + SKIPS + ("IDIV",)
+R0_WRITERS = ("LOAD", "STOR", "POP", "DUP", "CMP", "TRUNC", "RAND", "NOT")
+R0_WRITERS += ("MVTO", *ARITHMETIC)
+R0_NEUTRAL = ("PUSH", "PUSHF", "SET", "UNSET", "SETPX")
+ROM_R0_WRITERS = ("WRITE", "MOVE")
+MAX_PASSES = 16
+
+
+def as_number(text):
+    """Converter um operando numerico como a LogoVM, ou devolver None."""
+    try:
+        value = int(text)
+    except ValueError:
+        try:
+            value = float(text)
+        except ValueError:
+            return None
+    return value if math.isfinite(value) else None
+
+
+class Peephole:
+    """Otimizar os procedimentos de um programa montado."""
+
+    def __init__(self, functions):
+        """Analisar o programa: variaveis temporarias e uso de IDIV."""
+        self.functions = functions
+        self.uses_idiv = any(
+            ins[0] == "IDIV" for code in functions.values() for ins in code
+        )
+        reads, stored_reads = {}, {}
+        for code in functions.values():
+            pinned, targets = self.skip_positions(code)
+            for pc, (opcode, arg, _) in enumerate(code):
+                if opcode not in ("LOAD", "CMP") or arg is None:
+                    continue
+                reads[arg] = reads.get(arg, 0) + 1
+                previous = code[pc - 1] if pc > 0 else None
+                if (
+                    opcode == "LOAD"
+                    and previous is not None
+                    and previous[:2] == ("STOR", arg)
+                    and pc - 1 not in pinned
+                    and pc not in targets
+                ):
+                    stored_reads[arg] = stored_reads.get(arg, 0) + 1
+        self.temporaries = {
+            name
+            for name, count in stored_reads.items()
+            if reads[name] == count
+        }
+
+    def referenced_labels(self):
+        """Obter as etiquetas usadas por algum desvio do programa."""
+        return {
+            arg
+            for code in self.functions.values()
+            for opcode, arg, _ in code
+            if opcode == "JP" or opcode in CONDITIONS
+        }
+
+    @staticmethod
+    def skip_positions(code):
+        """Obter as instrucoes saltadas e os alvos de SKIPZ/SKIPNZ."""
+        skips = [pc for pc, ins in enumerate(code) if ins[0] in SKIPS]
+        return {pc + 1 for pc in skips}, {pc + 2 for pc in skips}
+
+    def r0_dead(self, code, pc):
+        """Verificar se o valor de R0 antes de `pc` nunca e observado."""
+        for opcode, arg, _ in code[pc:]:
+            if opcode in R0_READERS:
+                return False
+            if opcode in R0_WRITERS or opcode == "HALT":
+                return True
+            if opcode == "CALL":
+                symbol = get_symbol(arg)
+                if symbol is None or symbol["type"] != "INT":
+                    return False
+                if arg in ROM_R0_WRITERS:
+                    return True
+            elif opcode not in R0_NEUTRAL:
+                return False
+        return False
+
+    def fold(self, code):
+        """Dobrar constantes e remover pares STOR/LOAD e CMP 0 redundantes."""
+        pinned, targets = self.skip_positions(code)
+        result = []
+        pc = 0
+        while pc < len(code):
+            window = code[pc : pc + 3]
+            opcodes = [ins[0] for ins in window]
+            free = not pinned.intersection(range(pc, pc + len(window)))
+            if (
+                free
+                and not self.uses_idiv
+                and opcodes[:2] == ["PUSH", "PUSH"]
+                and len(window) == 3
+                and opcodes[2] in ARITHMETIC
+                and self.r0_dead(code, pc + 3)
+            ):
+                value = self.evaluate(opcodes[2], window[0][1], window[1][1])
+                if value is not None:
+                    result.append(("PUSH", repr(value), window[0][2]))
+                    pc += 3
+                    continue
+            if (
+                opcodes[:2] == ["STOR", "LOAD"]
+                and window[0][1] == window[1][1]
+                and window[0][1] in self.temporaries
+                and not pinned.intersection((pc, pc + 1))
+                and pc + 1 not in targets
+                and self.r0_dead(code, pc + 2)
+            ):
+                pc += 2
+                continue
+            if (
+                opcodes[:2] == ["SUB", "CMP"]
+                and not self.uses_idiv
+                and as_number(window[1][1] or "") == 0
+                and pc + 1 not in pinned
+                and pc + 1 not in targets
+            ):
+                result.append(window[0])
+                pc += 2
+                continue
+            result.append(code[pc])
+            pc += 1
+        return result
+
+    @staticmethod
+    def evaluate(opcode, lhs, rhs):
+        """Calcular uma operacao constante, ou None se nao for possivel."""
+        lhs, rhs = as_number(lhs), as_number(rhs)
+        if lhs is None or rhs is None:
+            return None
+        if opcode in ("SHFTL", "POW") and abs(rhs) > 64:
+            return None
+        try:
+            value = ARITHMETIC[opcode](lhs, rhs)
+        except (ArithmeticError, TypeError, ValueError):
+            return None
+        if not isinstance(value, (int, float)):
+            return None
+        # Descartar inteiros grandes antes do repr, que os limita.
+        if isinstance(value, int) and value.bit_length() > 128:
+            return None
+        if len(repr(value)) > 32:
+            return None
+        return as_number(repr(value))
+
+    @staticmethod
+    def label_positions(code):
+        """Mapear etiquetas do procedimento para a sua posicao."""
+        return {
+            arg: pc for pc, (opcode, arg, _) in enumerate(code)
+            if opcode == "LABEL"
+        }
+
+    def thread_jumps(self, code):
+        """Desviar diretamente para o destino final de cadeias de JP."""
+        labels = self.label_positions(code)
+
+        def target(name):
+            seen = set()
+            while name in labels and name not in seen:
+                seen.add(name)
+                pc = labels[name]
+                while pc < len(code) and code[pc][0] == "LABEL":
+                    pc += 1
+                if pc == len(code) or code[pc][0] != "JP":
+                    break
+                name = code[pc][1]
+            return name
+
+        result = []
+        for opcode, arg, lineno in code:
+            if opcode == "JP" or opcode in CONDITIONS:
+                arg = target(arg)
+            result.append((opcode, arg, lineno))
+        return result
+
+    @staticmethod
+    def falls_into(code, pc, name):
+        """Verificar se a execucao a partir de `pc` passa pela etiqueta."""
+        while pc < len(code) and code[pc][0] == "LABEL":
+            if code[pc][1] == name:
+                return True
+            pc += 1
+        return False
+
+    def remove_unreachable(self, code, referenced):
+        """Remover instrucoes inalcancaveis, etiquetas e desvios inuteis."""
+        labels = self.label_positions(code)
+        pinned, _ = self.skip_positions(code)
+        reached = set()
+        pending = [0]
+        while pending:
+            pc = pending.pop()
+            if pc in reached or pc >= len(code):
+                continue
+            reached.add(pc)
+            opcode, arg, _ = code[pc]
+            if opcode == "JP" or opcode in CONDITIONS:
+                if arg not in labels:
+                    return code
+                pending.append(labels[arg])
+            if opcode in SKIPS:
+                pending.append(pc + 2)
+            if opcode not in TERMINATORS:
+                pending.append(pc + 1)
+        result = []
+        for pc, (opcode, arg, lineno) in enumerate(code):
+            if pc not in reached:
+                continue
+            if pc not in pinned:
+                if opcode == "LABEL" and arg not in referenced:
+                    continue
+                if opcode == "JP" and self.falls_into(code, pc + 1, arg):
+                    continue
+            result.append((opcode, arg, lineno))
+        return result
+
+    def optimize(self, name):
+        """Otimizar o procedimento `name` ate o codigo nao mudar mais."""
+        code = self.functions[name]
+        if any(ins[0] == "JR" for ins in code):
+            return code
+        for _ in range(MAX_PASSES):
+            previous = code
+            code = self.thread_jumps(self.fold(code))
+            self.functions[name] = code
+            code = self.remove_unreachable(code, self.referenced_labels())
+            self.functions[name] = code
+            if code == previous:
+                break
+        return code
+
+
+def __split(text, lineno):
+    """Separar o texto de uma instrucao em (opcode, operando, linha)."""
+    opcode, *arg = text.split(" ", 1)
+    return (opcode, arg[0] if arg else None, lineno)
+
+
+def optimize_program():
+    """Otimizar todos os procedimentos; devolve as instrucoes removidas."""
+    functions = {
+        name: [
+            __split(text, lineno)
+            for text, lineno in zip(data["code"], data["lines"])
+        ]
+        for name, data in get_symbols_by_class("FUNC").items()
+        if data.get("code") is not None
+    }
+    optimizer = Peephole(dict(functions))
+    removed = 0
+    for name, code in functions.items():
+        optimized = optimizer.optimize(name)
+        removed += len(code) - len(optimized)
+        logging.info(
+            "Peephole: %s: %d -> %d instructions",
+            name,
+            len(code),
+            len(optimized),
+        )
+        set_symbol(
+            name,
+            code=[
+                opcode if arg is None else f"{opcode} {arg}"
+                for opcode, arg, _ in optimized
+            ],
+            lines=[lineno for _, _, lineno in optimized],
+        )
+    return removed
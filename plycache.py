@@ -0,0 +1,53 @@
+"""Cache das tabelas do PLY para o montador LogoASM.
+
+As tabelas do lexer e do parser sao salvas em um diretorio de cache, com
+nomes derivados de um hash da gramatica (codigo do lexer e do parser) e
+da versao do PLY. Assim, elas so sao reconstruidas quando a gramatica
+muda. Defina LOGOVM_PLY_CACHE=0 para desativar o cache.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import os
+
+import ply
+from ply import lex, yacc
+
+
+def enabled():
+    """Verificar se o cache de tabelas esta ativo."""
+    return os.environ.get("LOGOVM_PLY_CACHE", "1") != "0"
+
+
+def cache_dir():
+    """Obter (e criar) o diretorio de cache das tabelas."""
+    base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    path = os.path.join(base, "logovm")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def grammar_hash(*modules):
+    """Calcular o hash da gramatica definida pelos modulos dados."""
+    digest = hashlib.sha256(ply.__version__.encode())
+    digest.update(f"{lex.__tabversion__}:{yacc.__tabversion__}".encode())
+    for module in modules:
+        with open(module.__file__, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:16]
+
+
+def load_lextab(name):
+    """Carregar o modulo lextab `name` do cache, ou None se nao existe."""
+    filename = os.path.join(cache_dir(), f"{name}.py")
+    if not os.path.exists(filename):
+        return None
+    spec = importlib.util.spec_from_file_location(name, filename)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception:  # pylint: disable=broad-except
+        logging.warning("Ignoring invalid lexer table: %s", filename)
+        return None
+    return module
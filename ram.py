@@ -1,55 +1,90 @@
-"""Funções internas do LogoVM."""
-
-def read_input():
-    """Implementacao do comando READ."""
-    value = input()
-    try:
-        try:
-            reg[6] = int(value)
-        except ValueError:
-            reg[6] = float(value)
-    except ValueError:
-        reg[6] = value
-    stack_push(reg[6])
-
-
-def write_output():
-    """Implementacao do comando WRITE."""
-
-    def escape(string):
-        chars = {"\\n": "\n", "\\t": "\t"}
-        for a, b in chars.items():
-            string = string.replace(a, b)
-        return string
-
-    global stack
-    count = reg[0] = stack_pop()
-    data = []
-    while count > 0:
-        data.append(escape(str(stack_pop())))
-        count -= 1
-    print("".join(data[::-1]), end="")
-
-
-def __rad(angle):
-    """Converter graus em radianos."""
-    return angle * pi / 180
-
-
-def move():
-    """Implementacao da instrucao MOVE."""
-    global __turtle
-    length = stack_pop()
-    angle = -__rad(stack_pop())
-    get_pos()
-    reg[2] = reg[0] + cos(angle) * (length - 1)
-    reg[4] = reg[1] + sin(angle) * (length - 1)
-    draw_line()
-
-
-internal = {
-    "READ": read_input,
-    "WRITE": write_output,
-    "CLRSCR": reset_video,
-    "MOVE": move,
+"""Funções internas do LogoVM."""
+
+from math import cos, sin, pi
+
+from logovm.machinery import Machine
+
+
+def read_input(vm):
+    """Implementacao do comando READ."""
+    reg = vm.reg
+    value = input()
+    try:
+        try:
+            reg[6] = int(value)
+        except ValueError:
+            reg[6] = float(value)
+    except ValueError:
+        reg[6] = value
+    vm.stack_push(reg[6])
+
+
+def write_output(vm):
+    """Implementacao do comando WRITE."""
+
+    def escape(string):
+        chars = {"\\n": "\n", "\\t": "\t"}
+        for a, b in chars.items():
+            string = string.replace(a, b)
+        return string
+
+    count = vm.reg[0] = vm.stack_pop()
+    data = []
+    while count > 0:
+        data.append(escape(str(vm.stack_pop())))
+        count -= 1
+    print("".join(data[::-1]), end="")
+
+
+def __rad(angle):
+    """Converter graus em radianos."""
+    return angle * pi / 180
+
+
+def move(vm):
+    """Implementacao da instrucao MOVE."""
+    reg = vm.reg
+    length = vm.stack_pop()
+    angle = -__rad(vm.stack_pop())
+    vm.get_pos()
+    reg[2] = reg[0] + cos(angle) * (length - 1)
+    reg[3] = reg[1] + sin(angle) * (length - 1)
+    vm.draw_line()
+
+
+def __pop_args(vm, count):
+    """Retirar `count` argumentos da pilha, na ordem em que foram dados."""
+    return [vm.stack_pop() for _ in range(count)][::-1]
+
+
+def rect(vm):
+    """Implementacao da rotina RECT: x y largura altura."""
+    vm.fill_rect(*__pop_args(vm, 4))
+
+
+def circle(vm):
+    """Implementacao da rotina CIRCLE: x y raio."""
+    vm.fill_circle(*__pop_args(vm, 3))
+
+
+def fill(vm):
+    """Implementacao da rotina FILL: x y."""
+    vm.flood_fill(*__pop_args(vm, 2))
+
+
+def copy_rect(vm):
+    """Implementacao da rotina BLIT: x y largura altura x_destino y_destino."""
+    vm.blit(*__pop_args(vm, 6))
+
+
+internal = {
+    "READ": read_input,
+    "WRITE": write_output,
+    "CLRSCR": Machine.reset_video,
+    "MOVE": move,
+    "RECT": rect,
+    "CIRCLE": circle,
+    "FILL": fill,
+    "BLIT": copy_rect,
+    "FRAME": Machine.save_frame,
 }
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""Analisador lexico rapido do LogoASM.
+
+Alternativa ao lexer do PLY (`logoasm.lexer`) que produz os mesmos
+tokens, com os mesmos tipos, valores, linhas e posicoes. As regras sao
+tentadas na ordem do PLY (primeiro as funcoes `t_*`, na ordem em que
+foram definidas, depois os operadores, da maior expressao regular para a
+menor), mas em uma unica expressao regular, sem chamadas de funcao nem
+registro de log por token.
+"""
+
+import re
+
+from ply.lex import LexToken
+
+from logoasm.lexer import OPERATORS, RESERVED, IllegalCharacter
+
+KEYWORDS = frozenset(word for word in RESERVED if not word.startswith("."))
+# Os caracteres ignorados antes de cada token fazem parte do mesmo casamento.
+# As regras ate COMMENT comecam por caracteres distintos, entao podem ser
+# ordenadas pela frequencia; os operadores mantem a ordem do PLY.
+PATTERN = re.compile(
+    "[ \t\r]*(?:"
+    + "|".join(
+        [
+            r"(?P<ID>[_@a-zA-Z][_@.a-zA-Z0-9]*)",
+            r"(?P<NEWLINE>\n+)",
+            r"(?P<DIRECTIVE>[.](?:CODE|DATA|START|INIT|IMPORT))",
+            r"(?P<LABEL>[:][_@a-zA-Z][_@.a-zA-Z0-9]*)",
+            r"(?P<STRING>'[^'\n]*'|\"[^\"\n]*\")",
+            r"(?P<NUMBER>[+-]?\d+(?:[.]\d*)?)",
+            r"(?P<COMMENT>[#][^\n]*)",
+            *(
+                f"(?P<{name}>{regex})"
+                for regex, name in sorted(
+                    OPERATORS.items(),
+                    key=lambda item: len(item[0]),
+                    reverse=True,
+                )
+            ),
+            r"(?P<END>\Z)",
+            r"(?P<ERROR>.)",
+        ]
+    )
+    + ")"
+)
+
+
+class Token(LexToken):
+    """Token do PLY com atributos fixos, mais barato de criar."""
+
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, kind, value, lineno, lexpos):
+        """Inicializar o token."""
+        self.type = kind
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+
+class Scanner:
+    """Lexer com a interface do lexer do PLY usada pelo `yacc`."""
+
+    def __init__(self):
+        """Inicializar o lexer sem entrada."""
+        self.lexdata = ""
+        self.lexpos = 0
+        self.lineno = 1
+        self.__tokens = iter(())
+
+    def input(self, data):
+        """Definir o texto a ser analisado."""
+        self.lexdata = data
+        self.lexpos = 0
+        self.__tokens = self.tokenize(data)
+
+    def token(self):
+        """Obter o proximo token, ou None no fim da entrada."""
+        return next(self.__tokens, None)
+
+    def __iter__(self):
+        """Iterar sobre os tokens restantes."""
+        return self.__tokens
+
+    def tokenize(self, data):
+        """Gerar os tokens do texto `data`."""
+        keywords = KEYWORDS
+        lineno = self.lineno
+        for found in PATTERN.finditer(data):
+            kind = group = found.lastgroup
+            if kind == "ID":
+                value = found.group(kind)
+                upper = value.upper()
+                if upper in keywords:
+                    kind = upper
+            elif kind == "NEWLINE":
+                lineno += len(found.group(kind))
+                self.lineno = lineno
+                continue
+            elif kind == "NUMBER":
+                value = found.group(kind)
+                value = float(value) if "." in value else int(value)
+            elif kind == "STRING":
+                value = found.group(kind)[1:-1]
+            elif kind == "LABEL":
+                value = found.group(kind)[1:]
+            elif kind == "DIRECTIVE":
+                value = kind = found.group(kind)[1:]
+            elif kind in ("COMMENT", "END"):
+                continue
+            elif kind == "ERROR":
+                self.lexpos = found.start(group)
+                raise IllegalCharacter(found.group(group), lineno)
+            else:
+                value = found.group(kind)
+            self.lexpos = found.end()
+            yield Token(kind, value, lineno, found.start(group))
+        self.lexpos = len(data)
+
+
+def scanner():
+    """Criar novo objeto do lexer rapido."""
+    return Scanner()
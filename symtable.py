@@ -1,89 +1,238 @@
-"""Implementacao da tabela de simbolos."""
-
-__symtable = {}
-case_insensitive_symtable = False
-
-
-class SymbolRedefinitionError(Exception):
-    """Erro gerado quando um símbolo já está definido."""
-
-    def __init__(self, symbol, lineno, original=None):
-        """Erro de inicialização com mensagem adequada."""
-        super().__init__(
-            f"Redeclaration of symbol "
-            f"'{original if original else symbol['name']}':{lineno}:"
-            f"original declaration at line {symbol['lineno']}"
-        )
-
-
-class InternalError(Exception):
-    """Erro gerado quando um símbolo já está definido."""
-
-    def __init__(self, msg):
-        """Erro de inicialização com mensagem adequada."""
-        super().__init__(f"Internal error: {msg}")
-
-
-def __tr_symbol(symbol):
-    return symbol.upper() if case_insensitive_symtable else symbol, symbol
-
-
-def add_symbol(symbol, sym_type, **kwargs):
-    """Criar novo símbolo na tabela de símbolos."""
-    symbol, original = __tr_symbol(symbol)
-
-    obj = __symtable.get(symbol)
-    if obj:
-        lineno = symbol.get("lineno")
-        if lineno >= 0:
-            raise SymbolRedefinitionError(obj, lineno, original)
-        obj.update(kwargs)
-    else:
-        kwargs["name"] = symbol
-        kwargs["type"] = sym_type
-        __symtable[symbol] = kwargs
-
-
-def set_symbol(symbol, **kwargs):
-    """Definir valores de um símbolo na tabela de símbolos."""
-    symbol, original = __tr_symbol(symbol)
-    obj = __symtable.get(symbol)
-    if obj is None:
-        raise InternalError(f"Symbol not defined: {original}")
-    if "name" in kwargs:
-        raise InternalError(
-            f"Cannot modify symbol '{original}' attribute 'name'."
-        )
-    if "lineno" in kwargs and not obj.get("lineno", -1) < 0:
-        raise InternalError(
-            f"Cannot modify symbol {original} attribute 'line'."
-        )
-    obj.update(kwargs)
-
-
-def get_symbol(symbol):
-    """Recuperar símbolo da tabela de símbolos."""
-    return __symtable.get(__tr_symbol(symbol)[0])
-
-
-def get_symbols_by_class(symtype):
-    """Recupere todos os símbolos com um determinado tipo da tabela de símbolos."""
-    return {k: v for k, v in __symtable.items() if v["type"] == symtype}
-
-
-def remove_symbol(symbol):
-    """Remover símbolo da tabela de símbolos."""
-    symbol, original = __tr_symbol(symbol)
-    if symbol in __symtable:
-        del __symtable[symbol]
-    else:
-        raise InternalError(f"Symbol not defined: {original}")
-
-
-def increment_symbol_usage(symbol, lineno, amount=1):
-    """Incrementar o atributo 'uso' do símbolo pelo valor especificado."""
-    sym = get_symbol(symbol)
-    if sym is None:
-        raise Exception(f"Unknown symbol:{lineno}:'{symbol}'")
-    usage = sym.get("usage", 0) + amount
-    set_symbol(symbol, usage=usage)
\ No newline at end of file
+"""Implementacao da tabela de simbolos.
+
+As funcoes do modulo operam sobre a tabela ativa da thread corrente
+(veja `set_symbol_table`), criada sob demanda.
+"""
+
+import threading
+
+__active = threading.local()
+case_insensitive_symtable = False
+
+
+class SymbolRedefinitionError(Exception):
+    """Erro gerado quando um símbolo já está definido."""
+
+    def __init__(self, symbol, lineno, original=None):
+        """Erro de inicialização com mensagem adequada."""
+        super().__init__(
+            f"Redeclaration of symbol "
+            f"'{original if original else symbol['name']}':{lineno}:"
+            f"original declaration at line {symbol['lineno']}"
+        )
+
+
+class InternalError(Exception):
+    """Erro gerado quando um símbolo já está definido."""
+
+    def __init__(self, msg):
+        """Erro de inicialização com mensagem adequada."""
+        super().__init__(f"Internal error: {msg}")
+
+
+class Symbol:
+    """Registro compacto de um símbolo, com acesso no estilo de dict."""
+
+    __slots__ = (
+        "name",
+        "type",
+        "lineno",
+        "usage",
+        "_memory",
+        "_value",
+        "var_type",
+        "slot",
+        "code",
+        "lines",
+        "ops",
+        "pc",
+    )
+    fields = (
+        "name",
+        "type",
+        "lineno",
+        "usage",
+        "value",
+        "var_type",
+        "slot",
+        "code",
+        "lines",
+        "ops",
+        "pc",
+    )
+
+    def __init__(self, name, sym_type, memory, **kwargs):
+        """Inicializar símbolo; variáveis recebem um slot em `memory`."""
+        self.name = name
+        self.type = sym_type
+        self._memory = memory
+        if sym_type == "VAR":
+            self.slot = len(memory)
+            memory.append(None)
+        self.update(kwargs)
+
+    @property
+    def value(self):
+        """Valor do símbolo; para VAR, lido de `memory`."""
+        if self.type == "VAR":
+            return self._memory[self.slot]
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if self.type == "VAR":
+            self._memory[self.slot] = value
+        else:
+            self._value = value
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.fields:
+            raise InternalError(f"Invalid symbol attribute: '{key}'")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.fields and hasattr(self, key)
+
+    def get(self, key, default=None):
+        """Obter atributo, ou `default` se não definido."""
+        return getattr(self, key, default) if key in self.fields else default
+
+    def update(self, attrs):
+        """Atualizar vários atributos."""
+        for key, value in attrs.items():
+            self[key] = value
+
+    def items(self):
+        """Listar os atributos definidos."""
+        return [(k, getattr(self, k)) for k in self.fields if k in self]
+
+
+class SymbolTable:
+    """Tabela de símbolos de um programa e memória das suas variáveis."""
+
+    def __init__(self, case_insensitive=None):
+        """Inicializar tabela vazia."""
+        if case_insensitive is None:
+            case_insensitive = case_insensitive_symtable
+        self.case_insensitive = case_insensitive
+        self.symbols = {}
+        # Valores das variaveis (VAR), indexados pelo 'slot' do simbolo.
+        self.memory = []
+
+    def __tr_symbol(self, symbol):
+        return symbol.upper() if self.case_insensitive else symbol, symbol
+
+    def add_symbol(self, symbol, sym_type, **kwargs):
+        """Criar novo símbolo na tabela de símbolos."""
+        symbol, original = self.__tr_symbol(symbol)
+
+        obj = self.symbols.get(symbol)
+        if obj:
+            lineno = obj.get("lineno")
+            if lineno is not None and lineno >= 0:
+                raise SymbolRedefinitionError(
+                    obj, kwargs.get("lineno"), original
+                )
+            obj.update(kwargs)
+        else:
+            self.symbols[symbol] = Symbol(
+                symbol, sym_type, self.memory, **kwargs
+            )
+
+    def set_symbol(self, symbol, **kwargs):
+        """Definir valores de um símbolo na tabela de símbolos."""
+        symbol, original = self.__tr_symbol(symbol)
+        obj = self.symbols.get(symbol)
+        if obj is None:
+            raise InternalError(f"Symbol not defined: {original}")
+        if "name" in kwargs:
+            raise InternalError(
+                f"Cannot modify symbol '{original}' attribute 'name'."
+            )
+        if "lineno" in kwargs and not obj.get("lineno", -1) < 0:
+            raise InternalError(
+                f"Cannot modify symbol {original} attribute 'line'."
+            )
+        obj.update(kwargs)
+
+    def get_symbol(self, symbol):
+        """Recuperar símbolo da tabela de símbolos."""
+        return self.symbols.get(self.__tr_symbol(symbol)[0])
+
+    def get_symbols_by_class(self, symtype):
+        """Recuperar os símbolos de um determinado tipo."""
+        return {k: v for k, v in self.symbols.items() if v["type"] == symtype}
+
+    def iter_symbols(self):
+        """Recuperar todos os símbolos da tabela, em ordem de declaração."""
+        return list(self.symbols.items())
+
+    def remove_symbol(self, symbol):
+        """Remover símbolo da tabela de símbolos."""
+        symbol, original = self.__tr_symbol(symbol)
+        if symbol in self.symbols:
+            del self.symbols[symbol]
+        else:
+            raise InternalError(f"Symbol not defined: {original}")
+
+    def increment_symbol_usage(self, symbol, lineno, amount=1):
+        """Incrementar o atributo 'uso' do símbolo pelo valor especificado."""
+        sym = self.get_symbol(symbol)
+        if sym is None:
+            raise Exception(f"Unknown symbol:{lineno}:'{symbol}'")
+        usage = sym.get("usage", 0) + amount
+        self.set_symbol(symbol, usage=usage)
+
+
+def set_symbol_table(table):
+    """Ativar `table` como tabela de símbolos da thread corrente."""
+    __active.table = table
+
+
+def get_symbol_table():
+    """Obter a tabela de símbolos ativa, criando uma se necessário."""
+    table = getattr(__active, "table", None)
+    if table is None:
+        table = __active.table = SymbolTable()
+    return table
+
+
+def add_symbol(symbol, sym_type, **kwargs):
+    """Criar novo símbolo na tabela de símbolos."""
+    get_symbol_table().add_symbol(symbol, sym_type, **kwargs)
+
+
+def set_symbol(symbol, **kwargs):
+    """Definir valores de um símbolo na tabela de símbolos."""
+    get_symbol_table().set_symbol(symbol, **kwargs)
+
+
+def get_symbol(symbol):
+    """Recuperar símbolo da tabela de símbolos."""
+    return get_symbol_table().get_symbol(symbol)
+
+
+def get_symbols_by_class(symtype):
+    """Recupere todos os símbolos com um determinado tipo da tabela de símbolos."""
+    return get_symbol_table().get_symbols_by_class(symtype)
+
+
+def iter_symbols():
+    """Recuperar todos os símbolos da tabela, em ordem de declaração."""
+    return get_symbol_table().iter_symbols()
+
+
+def remove_symbol(symbol):
+    """Remover símbolo da tabela de símbolos."""
+    get_symbol_table().remove_symbol(symbol)
+
+
+def increment_symbol_usage(symbol, lineno, amount=1):
+    """Incrementar o atributo 'uso' do símbolo pelo valor especificado."""
+    get_symbol_table().increment_symbol_usage(symbol, lineno, amount)
@@ -0,0 +1,319 @@
+"""Pontos de rastreamento da LogoVM.
+
+Um rastreador recebe eventos de instrucao, pilha, flags e pixels. Sem
+rastreador instalado na VM (`vm.tracer is None`) nenhum evento e
+gerado, e nenhum argumento e formatado. Os rastreadores sao criados com
+a LogoVM que observam, e consultam os simbolos na tabela dela.
+"""
+
+import logging
+import sys
+import time
+from collections import Counter
+
+from logovm import machinery
+
+
+def set_tracer(vm, tracer):
+    """Instalar um rastreador na LogoVM, ou remover com `None`."""
+    vm.tracer = tracer
+
+
+def get_tracer(vm):
+    """Obter o rastreador instalado na LogoVM."""
+    return vm.tracer
+
+
+class Tracer:
+    """Rastreador base: ignora todos os eventos."""
+
+    def instruction(self, function, pc, instruction):
+        """Instrucao `instruction` prestes a executar em `function`:`pc`."""
+
+    def stack(self, stack):
+        """Conteudo da pilha apos um PUSH ou POP."""
+
+    def flag(self, flag, flags):
+        """Flag `flag` alterada; `flags` tem o novo valor do registrador."""
+
+    def pixel(self, x, y, color):
+        """Pixel (`x`, `y`) escrito com a cor `color`."""
+
+
+class LoggingTracer(Tracer):
+    """Registrar os eventos no logging, como o modo de depuracao `-dd`."""
+
+    def __init__(self, vm, level=logging.DEBUG):
+        """Inicializar o rastreador da `vm` com o nivel de log dos eventos."""
+        self.vm = vm
+        self.level = level
+
+    def instruction(self, function, pc, instruction):
+        """Registrar a instrucao executada."""
+        logging.log(
+            self.level,
+            "EXEC: %s:%d: %s",
+            function,
+            pc,
+            self.vm.symtable.get_symbol(function)["code"][pc],
+        )
+
+    def stack(self, stack):
+        """Registrar a pilha."""
+        logging.log(self.level, "STACK: %r", stack)
+
+    def flag(self, flag, flags):
+        """Registrar o registrador de flags."""
+        width = machinery.Flags.MAXFLAG + 1
+        logging.log(self.level, "FLAG: %s: 0b%s", flag, f"{flags:0{width}b}")
+
+    def pixel(self, x, y, color):
+        """Registrar a escrita na memoria de video."""
+        logging.log(self.level, "PIXEL: x=%s y=%s c=%s", x, y, color)
+
+
+class CountingTracer(Tracer):
+    """Contar instrucoes executadas, por opcode."""
+
+    def __init__(self, vm=None):
+        """Inicializar contadores."""
+        self.vm = vm
+        self.opcodes = Counter()
+        self.pixels = 0
+
+    def instruction(self, function, pc, instruction):
+        """Contar a instrucao."""
+        self.opcodes[instruction[0]] += 1
+
+    def pixel(self, x, y, color):
+        """Contar a escrita de pixel."""
+        self.pixels += 1
+
+    def report(self):
+        """Registrar o resumo das contagens."""
+        logging.warning(
+            "Instructions: %d Pixels: %d",
+            sum(self.opcodes.values()),
+            self.pixels,
+        )
+        for opcode, count in self.opcodes.most_common():
+            logging.warning("%-8s %d", opcode, count)
+
+
+class NgramTracer(Tracer):
+    """Contar sequencias de opcodes executadas em posicoes consecutivas.
+
+    Sao as sequencias candidatas a superinstrucoes: instrucoes vizinhas
+    no codigo, executadas uma apos a outra sem desvio.
+    """
+
+    def __init__(self, vm=None, sizes=(2, 3, 4)):
+        """Inicializar contadores para sequencias com os tamanhos dados."""
+        self.vm = vm
+        self.sizes = sizes
+        self.ngrams = Counter()
+        self.window = []
+        self.last = None
+
+    def instruction(self, function, pc, instruction):
+        """Contar as sequencias que terminam nesta instrucao."""
+        if self.last != (function, pc - 1):
+            self.window.clear()
+        self.last = (function, pc)
+        window = self.window
+        window.append(instruction[0])
+        del window[: -max(self.sizes)]
+        for size in self.sizes:
+            if len(window) >= size:
+                self.ngrams[tuple(window[-size:])] += 1
+
+    def report(self, top=20):
+        """Registrar as sequencias mais frequentes."""
+        for ngram, count in self.ngrams.most_common(top):
+            logging.warning("%10d %s", count, "; ".join(ngram))
+
+
+MAX_DEPTH = 64
+
+
+class ProfilingTracer(Tracer):
+    """Medir contagens e tempo por opcode, procedimento e linha do fonte.
+
+    O tempo entre dois eventos de instrucao e atribuido a primeira delas,
+    junto com a pilha de procedimentos em que executou. As pilhas sao
+    guardadas como indices de nos de uma arvore de chamadas, para que
+    recursoes profundas nao custem O(profundidade) por chamada: recursao
+    direta ocupa um unico no, e abaixo de MAX_DEPTH procedimentos os
+    quadros sao agrupados em "...". Os totais sao calculados apenas no
+    relatorio.
+    """
+
+    def __init__(self, vm, clock=time.perf_counter_ns):
+        """Inicializar o perfilador da LogoVM `vm`."""
+        self.vm = vm
+        self.clock = clock
+        self.counts = Counter()
+        self.times = Counter()
+        self.calls = Counter()
+        self.nodes = {}
+        self.tree = []
+        self.depths = []
+        self.path = []
+        self.frame = None
+        self.current = None
+        self.started = 0
+
+    def __node(self, parent, function):
+        """Obter o no da arvore de chamadas para `function` sob `parent`."""
+        if parent is not None:
+            if self.tree[parent][1] in (function, "..."):
+                return parent
+            if self.depths[parent] >= MAX_DEPTH:
+                function = "..."
+        node = self.nodes.get((parent, function))
+        if node is None:
+            node = self.nodes[(parent, function)] = len(self.tree)
+            self.tree.append((parent, function))
+            depth = 0 if parent is None else self.depths[parent]
+            self.depths.append(depth + 1)
+        return node
+
+    def __enter(self, function, depth):
+        """Ajustar o caminho na arvore de chamadas a pilha da VM."""
+        path = self.path
+        del path[depth:]
+        while len(path) < depth - 1:
+            name = self.vm.call_stack[len(path)]["name"]
+            path.append(self.__node(path[-1] if path else None, name))
+        parent = path[depth - 2] if depth > 1 else None
+        if len(path) < depth:
+            path.append(self.__node(parent, function))
+        elif self.tree[path[-1]][1] != function:
+            path[-1] = self.__node(parent, function)
+
+    def instruction(self, function, pc, instruction):
+        """Fechar o tempo da instrucao anterior e contar esta."""
+        now = self.clock()
+        if self.current is not None:
+            self.times[self.current] += now - self.started
+        depth = len(self.vm.call_stack)
+        if self.frame != (function, depth):
+            self.frame = (function, depth)
+            self.__enter(function, depth)
+        if pc == 0:
+            self.calls[function] += 1
+        self.current = (self.path[-1], function, pc, instruction[0])
+        self.counts[self.current] += 1
+        self.started = self.clock()
+
+    def finish(self):
+        """Fechar o tempo da ultima instrucao executada."""
+        if self.current is not None:
+            self.times[self.current] += self.clock() - self.started
+            self.current = None
+
+    def samples(self):
+        """Iterar (pilha, procedimento, opcode, texto, linha, contagem, tempo).
+        """
+        self.finish()
+        stacks = {}
+        for key, count in self.counts.items():
+            node, function, pc, opcode = key
+            if node not in stacks:
+                stacks[node] = self.call_path(node)
+            symbol = self.vm.symtable.get_symbol(function)
+            lineno = symbol["lines"][pc] if symbol.get("lines") else None
+            text = symbol["code"][pc] if symbol.get("code") else opcode
+            yield (
+                stacks[node],
+                function,
+                opcode,
+                text,
+                lineno,
+                count,
+                self.times[key],
+            )
+
+    def call_path(self, node):
+        """Obter a pilha de procedimentos de um no da arvore."""
+        stack = []
+        while node is not None:
+            node, function = self.tree[node]
+            stack.append(function)
+        return tuple(reversed(stack))
+
+    def collapsed(self):
+        """Agregar o tempo em pilhas no formato de flame graphs."""
+        stacks = Counter()
+        for sample in self.samples():
+            stack, function, opcode, text, lineno, _, elapsed = sample
+            frames = [*stack, f"{function}:{lineno}"]
+            if opcode == "CALL":
+                callee = self.vm.symtable.get_symbol(text.split()[-1])
+                if callee is not None and callee["type"] == "INT":
+                    frames.append(callee["name"])
+            stacks[";".join(frames)] += elapsed
+        return stacks
+
+    def write_collapsed(self, filename):
+        """Gravar as pilhas em microssegundos, uma por linha."""
+        with open(filename, "wt", encoding="utf-8") as output:
+            for stack, elapsed in sorted(self.collapsed().items()):
+                if elapsed >= 1000:
+                    output.write(f"{stack} {elapsed // 1000}\n")
+
+    def report(self, top=20, output=None):
+        """Imprimir as tabelas de opcodes, procedimentos e linhas."""
+        output = output or sys.stderr
+        opcodes, lines = {}, {}
+        procedures = {}
+        for sample in self.samples():
+            stack, function, opcode, _, lineno, count, elapsed = sample
+            for table, key in (
+                (opcodes, opcode),
+                (lines, (function, lineno)),
+            ):
+                total = table.setdefault(key, [0, 0])
+                total[0] += count
+                total[1] += elapsed
+            own = procedures.setdefault(function, [0, 0, 0])
+            own[0] += count
+            own[1] += elapsed
+            for name in {*stack, function} - {"..."}:
+                procedures.setdefault(name, [0, 0, 0])[2] += elapsed
+        total_time = sum(self.times.values()) or 1
+
+        def rows(table):
+            return sorted(table.items(), key=lambda item: -item[1][1])
+
+        def ms(elapsed):
+            return f"{elapsed / 1e6:10.3f} {100 * elapsed / total_time:6.1f}%"
+
+        header = f"{'count':>10s} {'ms':>10s} {'%':>7s}"
+        print(f"{'opcode':12s} {header}", file=output)
+        for opcode, (count, elapsed) in rows(opcodes):
+            print(f"{opcode:12s} {count:10d} {ms(elapsed)}", file=output)
+        print(
+            f"\n{'procedure':20s} {'calls':>8s} {'instr':>10s}"
+            f" {'self ms':>10s} {'%':>7s} {'total ms':>10s} {'%':>7s}",
+            file=output,
+        )
+        for name, (count, own, cumulative) in sorted(
+            procedures.items(), key=lambda item: -item[1][2]
+        ):
+            print(
+                f"{name:20s} {self.calls[name]:8d} {count:10d}"
+                f" {ms(own)} {ms(cumulative)}",
+                file=output,
+            )
+        print(f"\n{'line':26s} {header}", file=output)
+        for (name, lineno), (count, elapsed) in rows(lines)[:top]:
+            where = f"{name}:{lineno}"
+            print(f"{where:26s} {count:10d} {ms(elapsed)}", file=output)
+
+
+tracers = {
+    "log": LoggingTracer,
+    "count": CountingTracer,
+    "ngram": NgramTracer,
+}